@@ -17,23 +17,30 @@ Run options:
   plus scripts/ralph/ralph.py args: max_iterations, --cursor-timeout, --model, --debug
 """
 
+import functools
 import os
 import re
 import sys
-import shutil
-import json
-import subprocess
 from pathlib import Path
 
-# Get script directory and package root
-# Resolve symlinks to get the actual script location
-script_path = Path(__file__).resolve()
-SCRIPT_DIR = script_path.parent
-PACKAGE_ROOT = SCRIPT_DIR.parent
-# Try templates directory first, fall back to source directory
-TEMPLATES_DIR = PACKAGE_ROOT / 'templates'
-if not TEMPLATES_DIR.exists():
-    TEMPLATES_DIR = PACKAGE_ROOT
+
+@functools.lru_cache(maxsize=1)
+def _package_root():
+    """
+    PACKAGE_ROOT, resolved on first use rather than at import, so commands that
+    never touch the package (legacy `run`, `uninstall`) skip the symlink resolution.
+    """
+    # Resolve symlinks to get the actual script location
+    return Path(__file__).resolve().parent.parent
+
+
+@functools.lru_cache(maxsize=1)
+def _templates_dir():
+    """TEMPLATES_DIR: the templates directory if present, else the source tree (init only)."""
+    root = str(_package_root())
+    candidate = os.path.join(root, 'templates')
+    return candidate if os.path.isdir(candidate) else root
+
 
 GITIGNORE_MARKER_START = '# >>> ralph-cursor'
 GITIGNORE_MARKER_END = '# <<< ralph-cursor'
@@ -46,9 +53,66 @@ GITIGNORE_RALPH_LINES = [
     'scripts/ralph/archive/',
 ]
 
+# Templates copied by `init`: (src relative to TEMPLATES_DIR, dest relative to repo, executable)
+_REQUIRED_FILES = (
+    ('scripts/ralph/ralph.py', 'scripts/ralph/ralph.py', True),
+    ('scripts/ralph/cursor/prompt.cursor.md', 'scripts/ralph/cursor/prompt.cursor.md', False),
+)
+# Appended unless --no-cursorignore
+_CURSORIGNORE_FILE = ('.cursorignore', '.cursorignore', False)
+
+# Multi-line error banners, each emitted with a single write
+_RUN_NOT_INITIALIZED_MSG = (
+    'Error: Ralph is not initialized in this repository.\n'
+    '\n'
+    'The required file is missing:\n'
+    '  {script}\n'
+    '\n'
+    'To fix this:\n'
+    '  1. Portable: ralph run --project /path/to/repo (needs .beads there)\n'
+    '  2. Legacy: ralph init then ralph run\n'
+)
+_UNINSTALL_NOT_PYTHON_MSG = (
+    'Warning: The file found in PATH does not appear to be a Python script.\n'
+    '  Found: {path}\n'
+    '\n'
+    'This may not be the Ralph CLI. For safety, uninstall was aborted.\n'
+    '\n'
+    'If you are sure this is the correct file, remove it manually.\n'
+)
+_UNINSTALL_PERMISSION_DENIED_MSG = (
+    'Error: Permission denied when trying to remove:\n'
+    '  {path}\n'
+    '\n'
+    'Next steps:\n'
+    '  1. Try running with sudo: sudo ralph uninstall\n'
+    '  2. Or manually remove: rm {path}\n'
+)
+
+# Control characters (0x00-0x1F, 0x7F) except newline/tab, deleted from version bytes
+_VERSION_CTRL_BYTES = bytes(b for b in range(0x20) if b not in (0x09, 0x0A, 0x0D)) + b'\x7f'
+
+# Shebangs accepted as proof that the `ralph` found in PATH is our Python CLI
+_PYTHON_SHEBANGS = (b'#!/usr/bin/env python3', b'#!/usr/bin/python3')
+_PYTHON_SHEBANG_LEN = max(len(s) for s in _PYTHON_SHEBANGS)
+
+# Basic .cursor/cli.json template written by `init --cursor-cli`
+_CURSOR_CLI_JSON = (
+    b'{\n'
+    b'  "mcpServers": {\n'
+    b'    "cursor-ide-browser": {\n'
+    b'      "command": "node",\n'
+    b'      "args": []\n'
+    b'    }\n'
+    b'  }\n'
+    b'}\n'
+)
+
 
 def _git_path_tracked(repo_root: Path, rel_path: str) -> bool:
     """True if rel_path is in the git index (staged or committed)."""
+    import subprocess
+
     if not (repo_root / '.git').exists():
         return False
     try:
@@ -65,6 +129,8 @@ def _git_path_tracked(repo_root: Path, rel_path: str) -> bool:
 
 def _git_has_tracked_under_prefix(repo_root: Path, prefix: str) -> bool:
     """True if any indexed path matches prefix (directory tree)."""
+    import subprocess
+
     if not (repo_root / '.git').exists():
         return False
     try:
@@ -87,7 +153,7 @@ def _beads_init_optional_gitignore_lines(repo_root: Path):
     repo_root = repo_root.resolve()
     extra = []
     for name in ('AGENTS.md', 'CLAUDE.md'):
-        if not (repo_root / name).is_file():
+        if not os.path.isfile(repo_root / name):
             continue
         if _git_path_tracked(repo_root, name):
             continue
@@ -118,7 +184,7 @@ def apply_ralph_gitignore_block(repo_root: Path):
     repo_root = repo_root.resolve()
     path = repo_root / '.gitignore'
     block = _ralph_gitignore_block(repo_root)
-    existing = path.read_text(encoding='utf-8') if path.exists() else ''
+    existing = path.read_text(encoding='utf-8') if os.path.isfile(path) else ''
 
     pattern = re.compile(
         re.escape(GITIGNORE_MARKER_START) + r'\n.*?\n' + re.escape(GITIGNORE_MARKER_END) + r'\n?',
@@ -135,213 +201,399 @@ def apply_ralph_gitignore_block(repo_root: Path):
     path.write_text(new_content, encoding='utf-8')
 
 
-def parse_flags(args):
-    """Parse command line flags into a dictionary."""
+@functools.lru_cache(maxsize=8)
+def _which_in_path(name, path):
+    import shutil
+
+    return shutil.which(name, path=path)
+
+
+def _which(name):
+    """shutil.which() memoized per (name, PATH) so repeated lookups skip the PATH walk."""
+    return _which_in_path(name, os.environ.get('PATH'))
+
+
+def _dir_names(path, listings):
+    """
+    Return the set of names in directory path, creating it if missing.
+    listings caches one listdir per directory, so existence checks are set lookups.
+    """
+    names = listings.get(path)
+    if names is None:
+        try:
+            names = set(os.listdir(path))
+        except FileNotFoundError:
+            os.makedirs(path, exist_ok=True)
+            names = set()
+        listings[path] = names
+    return names
+
+
+_COPY_BUFSIZE = 1024 * 1024
+
+
+def _copy_contents(fsrc, fdst):
+    """
+    Copy all bytes from fsrc to fdst (binary file objects), letting the kernel
+    move them via os.copy_file_range (in-kernel, reflink-capable) or
+    os.sendfile where supported.
+    """
+    infd = fsrc.fileno()
+    outfd = fdst.fileno()
+    size = os.fstat(infd).st_size
+    # Each step copies up to count bytes at offset and returns how many it moved
+    kernel_copies = []
+    if hasattr(os, 'copy_file_range'):
+        kernel_copies.append(lambda count, off: os.copy_file_range(infd, outfd, count, off, off))
+    if hasattr(os, 'sendfile'):
+        kernel_copies.append(lambda count, off: os.sendfile(outfd, infd, off, count))
+    offset = 0
+    for kernel_copy in kernel_copies:
+        try:
+            while offset < size:
+                sent = kernel_copy(size - offset, offset)
+                if sent == 0:
+                    # Some filesystem/kernel pairs report 0 without copying anything
+                    break
+                offset += sent
+        except OSError:
+            # Unsupported for this filesystem pair (ENOSYS, EXDEV, EINVAL, ...);
+            # only safe to try the next method if nothing was written yet
+            if offset:
+                raise
+            continue
+        if offset >= size:
+            return
+        if offset:
+            # Stopped part way; finish the rest in user space below
+            break
+    # No (working) kernel copy; read into one reusable 1 MiB buffer from where it stopped
+    fsrc.seek(offset)
+    fdst.seek(offset)
+    buf = bytearray(_COPY_BUFSIZE)
+    view = memoryview(buf)
+    while True:
+        n = fsrc.readinto(buf)
+        if not n:
+            break
+        fdst.write(view[:n])
+
+
+def _set_mode(fd, path, mode):
+    """chmod through the open descriptor where supported (no second path lookup)."""
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, mode)
+    else:
+        os.chmod(path, mode)
+
+
+def _fast_copy(src, dst, mode=None):
+    """
+    Copy file contents from src to dst, then apply mode (if given) on the still
+    open destination. Other metadata is not copied. Like shutil.copy2, copying a
+    file onto itself raises shutil.SameFileError (before dst is truncated).
+    """
+    with open(src, 'rb') as fsrc:
+        src_st = os.fstat(fsrc.fileno())
+        try:
+            dst_st = os.stat(dst)
+        except FileNotFoundError:
+            pass
+        else:
+            if (dst_st.st_dev, dst_st.st_ino) == (src_st.st_dev, src_st.st_ino):
+                import shutil
+
+                raise shutil.SameFileError(f'{src!r} and {dst!r} are the same file')
+        with open(dst, 'wb') as fdst:
+            _copy_contents(fsrc, fdst)
+            if mode is not None:
+                _set_mode(fdst.fileno(), dst, mode)
+
+
+def _install_template(src, dest, executable):
+    """
+    Put one template in place, marking it executable when requested. src is a
+    template path, or bytes for small templates kept inline in this module.
+    """
+    mode = 0o755 if executable else None
+    if isinstance(src, bytes):
+        # Whole template in a single unbuffered write
+        fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, src)
+            if mode is not None:
+                _set_mode(fd, dest, mode)
+        finally:
+            os.close(fd)
+    else:
+        _fast_copy(src, dest, mode)
+
+
+def _run_copy_tasks(copy_tasks, created, skipped):
+    """
+    Run (src, dest, executable, label) copies concurrently. The files are
+    independent, so their I/O can overlap; results are recorded in task order.
+    See _install_template for the accepted src forms.
+    """
+    if not copy_tasks:
+        return
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(8, len(copy_tasks))) as executor:
+        futures = [
+            executor.submit(_install_template, src, dest, executable)
+            for src, dest, executable, _ in copy_tasks
+        ]
+        for (src, _, _, label), future in zip(copy_tasks, futures):
+            try:
+                future.result()
+                created.append(label)
+            except (PermissionError, OSError) as e:
+                if isinstance(src, bytes):
+                    print(f'Warning: Failed to create {label}: {e}', file=sys.stderr)
+                else:
+                    print(f'Error: Failed to copy file {label}: {e}', file=sys.stderr)
+                    print(f'  Source: {src}', file=sys.stderr)
+                skipped.append(label)
+
+
+@functools.lru_cache(maxsize=2)
+def _template_plan(include_cursorignore):
+    """init's template list with absolute source paths, joined once per process."""
+    templates_root = _templates_dir()
+    files = _REQUIRED_FILES + (_CURSORIGNORE_FILE,) if include_cursorignore else _REQUIRED_FILES
+    return tuple((os.path.join(templates_root, src), dest, executable) for src, dest, executable in files)
+
+
+def parse_flags(args, value_flags=()):
+    """
+    Parse command line flags into a dictionary in one pass.
+
+    Only flags named in value_flags take a value (``--flag VALUE`` or
+    ``--flag=VALUE``, even if VALUE starts with ``--``); every other flag is a
+    boolean switch and never consumes the next argument.
+    """
     flags = {}
-    i = 0
-    while i < len(args):
-        arg = args[i]
-        if arg.startswith('--'):
-            if i + 1 < len(args) and not args[i + 1].startswith('--'):
-                flags[arg] = args[i + 1]
-                i += 1
-            else:
-                flags[arg] = True
-        i += 1
+    it = iter(args)
+    for arg in it:
+        if arg[:2] != '--':
+            continue
+        name, eq, value = arg.partition('=')
+        if name in value_flags:
+            flags[name] = value if eq else next(it, True)
+        else:
+            flags[arg] = True
     return flags
 
 
 def handle_init(args):
     """Handle the 'init' command."""
+    import subprocess
+
     flags = parse_flags(args)
     force = flags.get('--force', False)
     cursor_cli = flags.get('--cursor-cli', False)
     copy_project_commands = flags.get('--copy-project-commands', False)
     no_cursorignore = flags.get('--no-cursorignore', False)
 
-    repo_root = Path.cwd()
-    target_dir = repo_root / 'scripts' / 'ralph'
+    cwd = os.getcwd()
+    target_dir = os.path.join(cwd, 'scripts', 'ralph')
+
+    # Directory listings (dir -> names), so each destination directory is read
+    # or created once and existence checks need no per-file stat
+    listings = {}
 
-    # Create scripts/ralph directory
-    if not target_dir.exists():
-        target_dir.mkdir(parents=True, exist_ok=True)
+    # Create scripts/ralph directory (announce it only when it is new)
+    try:
+        os.makedirs(target_dir)
+    except FileExistsError:
+        pass
+    else:
         print(f'Created: {target_dir}')
+        listings[target_dir] = set()
 
     # Check for Beads CLI
-    if not shutil.which('bd'):
-        print('Warning: Beads CLI (bd) not found in PATH', file=sys.stderr)
-        print('  Ralph requires Beads for task tracking.', file=sys.stderr)
-        print('  Please install Beads: https://github.com/steveyegge/beads', file=sys.stderr)
-        print('', file=sys.stderr)
+    if not _which('bd'):
+        sys.stderr.write(
+            'Warning: Beads CLI (bd) not found in PATH\n'
+            '  Ralph requires Beads for task tracking.\n'
+            '  Please install Beads: https://github.com/steveyegge/beads\n'
+            '\n'
+        )
         response = input('Continue anyway? (y/N): ').strip().lower()
         if response != 'y':
             print('Aborted.', file=sys.stderr)
             sys.exit(1)
     
-    # Check if Beads is initialized
-    beads_dir = repo_root / '.beads'
-    if not beads_dir.exists():
-        print('Beads not initialized in repository.', file=sys.stdout)
-        print('  Initializing Beads...', file=sys.stdout)
+    # Check if Beads is initialized. `bd init` only touches .beads/, so it runs
+    # in the background while the templates are copied and is reaped before the summary.
+    bd_proc = None
+    beads_dir = os.path.join(cwd, '.beads')
+    if not os.path.exists(beads_dir):
+        sys.stdout.write('Beads not initialized in repository.\n  Initializing Beads...\n')
         try:
-            result = subprocess.run(
+            bd_proc = subprocess.Popen(
                 ['bd', 'init'],
-                cwd=str(repo_root),
-                capture_output=True,
-                text=True,
-                timeout=30
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
             )
-            if result.returncode == 0:
-                print('  ✓ Beads initialized', file=sys.stdout)
-            else:
-                print(f'  Warning: Beads init failed: {result.stderr}', file=sys.stderr)
-                print('  You may need to run: bd init', file=sys.stderr)
-        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        except FileNotFoundError as e:
             print(f'  Warning: Could not initialize Beads: {e}', file=sys.stderr)
             print('  You may need to run: bd init', file=sys.stderr)
     
-    # Required files
-    required_files = [
-        {'src': 'scripts/ralph/ralph.py', 'dest': 'scripts/ralph/ralph.py', 'executable': True},
-        {'src': 'scripts/ralph/cursor/prompt.cursor.md', 'dest': 'scripts/ralph/cursor/prompt.cursor.md', 'executable': False},
-    ]
-    if not no_cursorignore:
-        required_files.append(
-            {'src': '.cursorignore', 'dest': '.cursorignore', 'executable': False},
-        )
-
     created = []
     skipped = []
+    copy_tasks = []
 
-    for file_info in required_files:
-        src_path = TEMPLATES_DIR / file_info['src']
-        dest_path = repo_root / file_info['dest']
-        dest_dir = dest_path.parent
-
-        # Verify source file exists
-        if not src_path.exists():
-            print(f'Warning: Source template file not found: {src_path}', file=sys.stderr)
-            print(f'  Expected location: {TEMPLATES_DIR}', file=sys.stderr)
-            print(f'  Package root: {PACKAGE_ROOT}', file=sys.stderr)
-            print(f'  This may indicate a corrupted or incomplete installation.', file=sys.stderr)
-            print(f'  The file {file_info["dest"]} will be skipped.', file=sys.stderr)
-            skipped.append(file_info['dest'])
-            continue
+    try:
+        # Fast path: re-running plain `init` over a complete install needs one stat per
+        # target, skipping the template lookups, source stats and directory creation
+        templates = _REQUIRED_FILES if no_cursorignore else _REQUIRED_FILES + (_CURSORIGNORE_FILE,)
+        dest_rels = [dest for _, dest, _ in templates]
+        if not (force or cursor_cli or copy_project_commands) and all(
+            os.path.isfile(os.path.join(cwd, dest)) for dest in dest_rels
+        ):
+            skipped.extend(dest_rels)
+            required_files = ()
+        else:
+            package_root = _package_root()
+            templates_dir = _templates_dir()
+            required_files = _template_plan(not no_cursorignore)
+
+        for src_path, dest_rel, executable in required_files:
+            dest_path = os.path.join(cwd, dest_rel)
+            dest_dir = os.path.dirname(dest_path)
+
+            # Verify source file exists
+            if not os.path.isfile(src_path):
+                sys.stderr.write(
+                    f'Warning: Source template file not found: {src_path}\n'
+                    f'  Expected location: {templates_dir}\n'
+                    f'  Package root: {package_root}\n'
+                    '  This may indicate a corrupted or incomplete installation.\n'
+                    f'  The file {dest_rel} will be skipped.\n'
+                )
+                skipped.append(dest_rel)
+                continue
 
-        # Create subdirectory if needed
-        if not dest_dir.exists():
+            # Create subdirectory if needed
             try:
-                dest_dir.mkdir(parents=True, exist_ok=True)
+                dest_names = _dir_names(dest_dir, listings)
             except (PermissionError, OSError) as e:
                 print(f'Error: Failed to create directory {dest_dir}: {e}', file=sys.stderr)
-                print(f'  Skipping file: {file_info["dest"]}', file=sys.stderr)
-                skipped.append(file_info['dest'])
+                print(f'  Skipping file: {dest_rel}', file=sys.stderr)
+                skipped.append(dest_rel)
                 continue
 
-        if dest_path.exists() and not force:
-            skipped.append(file_info['dest'])
-            continue
+            if os.path.basename(dest_path) in dest_names and not force:
+                skipped.append(dest_rel)
+                continue
 
-        try:
-            shutil.copy2(src_path, dest_path)
-            if file_info['executable']:
-                dest_path.chmod(0o755)
-            created.append(file_info['dest'])
-        except (PermissionError, OSError) as e:
-            print(f'Error: Failed to copy file {file_info["dest"]}: {e}', file=sys.stderr)
-            print(f'  Source: {src_path}', file=sys.stderr)
-            skipped.append(file_info['dest'])
-
-    # Optionally copy commands into project (legacy; default is global ~/.cursor/commands)
-    if copy_project_commands:
-        commands_src_dir = PACKAGE_ROOT / '.cursor' / 'commands'
-        if commands_src_dir.exists():
-            cursor_commands_dir = repo_root / '.cursor' / 'commands'
-            for command_file in commands_src_dir.iterdir():
-                if command_file.is_file() and command_file.suffix == '.md':
-                    dest_command_file = cursor_commands_dir / command_file.name
-
-                    if not cursor_commands_dir.exists():
-                        try:
-                            cursor_commands_dir.mkdir(parents=True, exist_ok=True)
-                        except (PermissionError, OSError) as e:
-                            print(f'Warning: Failed to create directory {cursor_commands_dir}: {e}', file=sys.stderr)
-                            skipped.append(f'.cursor/commands/{command_file.name}')
-                            continue
-
-                    if dest_command_file.exists() and not force:
-                        skipped.append(f'.cursor/commands/{command_file.name}')
+            copy_tasks.append((src_path, dest_path, executable, dest_rel))
+
+        # Optionally copy commands into project (legacy; default is global ~/.cursor/commands)
+        if copy_project_commands:
+            commands_src_dir = package_root / '.cursor' / 'commands'
+            if os.path.exists(commands_src_dir):
+                # Gather the command templates first, then create the target dir only if needed
+                with os.scandir(commands_src_dir) as entries:
+                    md_entries = [
+                        (entry.name, entry.path) for entry in entries
+                        if entry.is_file() and entry.name.endswith('.md')
+                    ]
+
+                cursor_commands_dir = os.path.join(cwd, '.cursor', 'commands')
+                commands_names = set()
+                commands_dir_ready = True
+                if md_entries:
+                    try:
+                        commands_names = _dir_names(cursor_commands_dir, listings)
+                    except (PermissionError, OSError) as e:
+                        print(f'Warning: Failed to create directory {cursor_commands_dir}: {e}', file=sys.stderr)
+                        commands_dir_ready = False
+
+                for name, src in md_entries:
+                    label = f'.cursor/commands/{name}'
+                    dest_command_file = os.path.join(cursor_commands_dir, name)
+                    if not commands_dir_ready or (name in commands_names and not force):
+                        skipped.append(label)
                     else:
-                        try:
-                            shutil.copy2(command_file, dest_command_file)
-                            created.append(f'.cursor/commands/{command_file.name}')
-                        except (PermissionError, OSError) as e:
-                            print(f'Warning: Failed to copy command file {command_file.name}: {e}', file=sys.stderr)
-                            skipped.append(f'.cursor/commands/{command_file.name}')
-
-    # Optional: .cursor/cli.json
-    if cursor_cli:
-        cursor_cli_file = repo_root / '.cursor' / 'cli.json'
-        cursor_dir = cursor_cli_file.parent
-        if not cursor_dir.exists():
+                        copy_tasks.append((src, dest_command_file, False, label))
+
+        # Optional: .cursor/cli.json (inline template, written alongside the copies)
+        if cursor_cli:
+            cursor_dir = os.path.join(cwd, '.cursor')
+            cursor_cli_file = os.path.join(cursor_dir, 'cli.json')
             try:
-                cursor_dir.mkdir(parents=True, exist_ok=True)
+                cursor_names = _dir_names(cursor_dir, listings)
             except (PermissionError, OSError) as e:
                 print(f'Warning: Failed to create directory {cursor_dir}: {e}', file=sys.stderr)
                 skipped.append('.cursor/cli.json')
             else:
-                if cursor_cli_file.exists() and not force:
+                if 'cli.json' in cursor_names and not force:
                     skipped.append('.cursor/cli.json')
                 else:
-                    # Create a basic template
-                    cli_template = {
-                        "mcpServers": {
-                            "cursor-ide-browser": {
-                                "command": "node",
-                                "args": []
-                            }
-                        }
-                    }
-                    try:
-                        with open(cursor_cli_file, 'w', encoding='utf-8') as f:
-                            json.dump(cli_template, f, indent=2)
-                            f.write('\n')
-                        created.append('.cursor/cli.json')
-                    except (PermissionError, OSError) as e:
-                        print(f'Warning: Failed to create .cursor/cli.json: {e}', file=sys.stderr)
-                        skipped.append('.cursor/cli.json')
+                    copy_tasks.append((_CURSOR_CLI_JSON, cursor_cli_file, False, '.cursor/cli.json'))
+
+        _run_copy_tasks(copy_tasks, created, skipped)
 
-    # Print summary
-    print('\n' + '='*60)
-    print('Ralph Initialization Summary')
-    print('='*60)
+        if bd_proc is not None:
+            try:
+                _, bd_stderr = bd_proc.communicate(timeout=30)
+                if bd_proc.returncode == 0:
+                    print('  ✓ Beads initialized', file=sys.stdout)
+                else:
+                    print(f'  Warning: Beads init failed: {bd_stderr}', file=sys.stderr)
+                    print('  You may need to run: bd init', file=sys.stderr)
+            except subprocess.TimeoutExpired as e:
+                bd_proc.kill()
+                bd_proc.communicate()
+                print(f'  Warning: Could not initialize Beads: {e}', file=sys.stderr)
+                print('  You may need to run: bd init', file=sys.stderr)
+    finally:
+        # Never leave `bd init` running behind an early exit (error or Ctrl+C)
+        if bd_proc is not None and bd_proc.poll() is None:
+            bd_proc.kill()
+            bd_proc.communicate()
+
+    # Print summary (one write per section instead of a print() per line)
+    rule = '=' * 60
+    lines = ['', rule, 'Ralph Initialization Summary', rule]
     if created:
-        print(f'\n✓ Created {len(created)} file(s):')
-        for f in created:
-            print(f'  • {f}')
+        lines.append(f'\n✓ Created {len(created)} file(s):')
+        lines.extend(f'  • {f}' for f in created)
     if skipped:
-        print(f'\n⊘ Skipped {len(skipped)} file(s) (already exist):')
-        for f in skipped:
-            print(f'  • {f}')
-        print('\n  Tip: Use --force to overwrite existing files')
-    
+        lines.append(f'\n⊘ Skipped {len(skipped)} file(s) (already exist):')
+        lines.extend(f'  • {f}' for f in skipped)
+        lines.append('\n  Tip: Use --force to overwrite existing files')
+
     if created:
-        print('\n' + '='*60)
-        print('✓ Ralph initialized successfully!')
-        print('='*60)
-        print('\nNext steps:')
-        print('  1. Bootstrap global Cursor commands (once per machine):')
-        print('       python3 <path-to-ralph-cursor>/bin/ralph.py install-cursor')
-        print('  2. In this repo: run `ralph setup --project .` or use the /ralph-setup slash command for .gitignore + Beads')
-        print('  3. Create a PRD (e.g. tasks/prd-feature-name.md) and Beads issues (see prd-to-beads in ~/.cursor/commands)')
-        print('  4. Portable loop: ralph run --project "$(pwd)"')
-        print('     Legacy: ralph run (uses ./scripts/ralph/ralph.py in this repo)')
-        print('\nFor more information, run: ralph --help')
+        lines += [
+            '',
+            rule,
+            '✓ Ralph initialized successfully!',
+            rule,
+            '\nNext steps:',
+            '  1. Bootstrap global Cursor commands (once per machine):',
+            '       python3 <path-to-ralph-cursor>/bin/ralph.py install-cursor',
+            '  2. In this repo: run `ralph setup --project .` or use the /ralph-setup slash command for .gitignore + Beads',
+            '  3. Create a PRD (e.g. tasks/prd-feature-name.md) and Beads issues (see prd-to-beads in ~/.cursor/commands)',
+            '  4. Portable loop: ralph run --project "$(pwd)"',
+            '     Legacy: ralph run (uses ./scripts/ralph/ralph.py in this repo)',
+            '\nFor more information, run: ralph --help',
+        ]
     else:
-        print('\n' + '='*60)
-        print('⊘ No files were created (all files already exist)')
-        print('='*60)
-        print('\nTip: Use --force to overwrite existing files')
+        lines += [
+            '',
+            rule,
+            '⊘ No files were created (all files already exist)',
+            rule,
+            '\nTip: Use --force to overwrite existing files',
+        ]
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
 
 def _strip_run_project_flag(args):
@@ -370,51 +622,48 @@ def handle_run(args):
 
     With --project DIR: runs PACKAGE_ROOT/scripts/ralph/ralph.py with cwd=DIR (portable).
     Otherwise: runs repo-local scripts/ralph/ralph.py (legacy).
+    The runner is executed in this interpreter (as __main__) rather than in a
+    second python3 process, so its exit status and signals reach the caller directly.
     """
     project_raw, forward_args = _strip_run_project_flag(args)
 
     if project_raw is not None:
         project_dir = Path(project_raw).expanduser().resolve()
-        if not project_dir.is_dir():
+        if not os.path.isdir(project_dir):
             print(f'Error: --project is not a directory: {project_raw}', file=sys.stderr)
             sys.exit(1)
         beads_dir = project_dir / '.beads'
-        if not beads_dir.exists():
-            print('Error: Beads not initialized in --project directory.', file=sys.stderr)
-            print(f'  Missing: {beads_dir}', file=sys.stderr)
-            print('  Run: bd init', file=sys.stderr)
-            print('  (in that repository)', file=sys.stderr)
+        if not os.path.exists(beads_dir):
+            sys.stderr.write(
+                'Error: Beads not initialized in --project directory.\n'
+                f'  Missing: {beads_dir}\n'
+                '  Run: bd init\n'
+                '  (in that repository)\n'
+            )
             sys.exit(1)
-        runner_script = PACKAGE_ROOT / 'scripts' / 'ralph' / 'ralph.py'
-        if not runner_script.is_file():
+        runner_script = _package_root() / 'scripts' / 'ralph' / 'ralph.py'
+        if not os.path.isfile(runner_script):
             print('Error: Bundled runner not found (incomplete ralph-cursor checkout):', file=sys.stderr)
             print(f'  {runner_script}', file=sys.stderr)
             sys.exit(1)
         cwd = str(project_dir)
     else:
-        repo_root = Path.cwd()
-        runner_script = repo_root / 'scripts' / 'ralph' / 'ralph.py'
-        cwd = str(repo_root)
-
-        if not runner_script.exists():
-            print('Error: Ralph is not initialized in this repository.', file=sys.stderr)
-            print('', file=sys.stderr)
-            print('The required file is missing:', file=sys.stderr)
-            print(f'  {runner_script}', file=sys.stderr)
-            print('', file=sys.stderr)
-            print('To fix this:', file=sys.stderr)
-            print('  1. Portable: ralph run --project /path/to/repo (needs .beads there)', file=sys.stderr)
-            print('  2. Legacy: ralph init then ralph run', file=sys.stderr)
+        # Legacy runner lives in the current directory; relative paths avoid a
+        # getcwd() here and a chdir() before exec
+        cwd = None
+        runner_script = Path('scripts', 'ralph', 'ralph.py')
+
+        if not os.path.exists(runner_script):
+            sys.stderr.write(_RUN_NOT_INITIALIZED_MSG.format(script=runner_script))
             sys.exit(1)
 
-    runner_script_resolved = runner_script.resolve()
-    if not runner_script_resolved.is_file():
+    if not os.path.isfile(runner_script):
         print('Error: Runner script path is not a file:', file=sys.stderr)
         print(f'  {runner_script}', file=sys.stderr)
         sys.exit(1)
 
     try:
-        if not runner_script_resolved.suffix == '.py':
+        if not runner_script.suffix == '.py':
             print('Error: Runner script does not have .py extension:', file=sys.stderr)
             print(f'  {runner_script}', file=sys.stderr)
             sys.exit(1)
@@ -426,30 +675,52 @@ def handle_run(args):
             print('Error: Invalid argument (contains null byte)', file=sys.stderr)
             sys.exit(1)
 
+    import types
+
+    script_path = str(runner_script)
+    saved_cwd = None
     try:
-        result = subprocess.run(
-            ['python3', str(runner_script_resolved)] + forward_args,
-            cwd=cwd,
-        )
-        sys.exit(result.returncode)
-    except FileNotFoundError:
-        print('Error: python3 is not available in your PATH.', file=sys.stderr)
-        print('', file=sys.stderr)
-        print('Please ensure Python 3 is installed and available.', file=sys.stderr)
-        sys.exit(1)
+        with open(script_path, 'rb') as f:
+            code = compile(f.read(), script_path, 'exec')
+        if cwd is not None:
+            saved_cwd = os.getcwd()
+            os.chdir(cwd)
     except Exception as e:
         print(f'Error: Failed to execute runner script: {e}', file=sys.stderr)
         print(f'  Script: {runner_script}', file=sys.stderr)
         sys.exit(1)
 
+    # Same view of argv, sys.path and __main__ the runner gets as `python3 ralph.py ...`.
+    # Errors raised by the runner itself propagate with their traceback; the
+    # caller's argv, sys.path[0], cwd and __main__ are restored either way.
+    saved_argv = sys.argv
+    saved_path0 = sys.path[0]
+    saved_main = sys.modules.get('__main__')
+    sys.argv = [script_path] + forward_args
+    sys.path[0] = os.path.dirname(os.path.abspath(script_path))
+    main_module = types.ModuleType('__main__')
+    main_module.__file__ = script_path
+    sys.modules['__main__'] = main_module
+    try:
+        exec(code, main_module.__dict__)
+    finally:
+        sys.modules['__main__'] = saved_main
+        sys.argv = saved_argv
+        sys.path[0] = saved_path0
+        if saved_cwd is not None:
+            os.chdir(saved_cwd)
+
 
 def handle_install_cursor(args):
     """Copy package .cursor/commands into ~/.cursor/commands/ and write package_root config."""
+    import shutil
+
     flags = parse_flags(args)
     force = flags.get('--force', False)
+    package_root = _package_root()
 
-    commands_src = PACKAGE_ROOT / '.cursor' / 'commands'
-    if not commands_src.is_dir():
+    commands_src = package_root / '.cursor' / 'commands'
+    if not os.path.isdir(commands_src):
         print('Error: Source commands directory not found:', file=sys.stderr)
         print(f'  {commands_src}', file=sys.stderr)
         sys.exit(1)
@@ -464,57 +735,65 @@ def handle_install_cursor(args):
 
     copied = []
     skipped = []
-    for src_file in sorted(commands_src.glob('*.md')):
-        if not src_file.is_file():
-            continue
-        dest_file = dest / src_file.name
-        if dest_file.exists() and not force:
-            skipped.append(src_file.name)
+    # One directory read; DirEntry.is_file() answers from the cached d_type
+    with os.scandir(commands_src) as entries:
+        md_entries = sorted(
+            (entry.name, entry.path) for entry in entries
+            if entry.name.endswith('.md') and entry.is_file()
+        )
+    for name, src_file in md_entries:
+        dest_file = dest / name
+        if os.path.exists(dest_file) and not force:
+            skipped.append(name)
             continue
         try:
             shutil.copy2(src_file, dest_file)
-            copied.append(src_file.name)
+            copied.append(name)
         except (OSError, PermissionError) as e:
-            print(f'Warning: Could not copy {src_file.name}: {e}', file=sys.stderr)
-            skipped.append(src_file.name)
+            print(f'Warning: Could not copy {name}: {e}', file=sys.stderr)
+            skipped.append(name)
 
     config_dir = home / '.config' / 'ralph-cursor'
     try:
         config_dir.mkdir(parents=True, exist_ok=True)
         root_file = config_dir / 'package_root'
-        root_file.write_text(str(PACKAGE_ROOT.resolve()) + '\n', encoding='utf-8')
+        root_file.write_text(str(package_root) + '\n', encoding='utf-8')
     except (OSError, PermissionError) as e:
         print(f'Warning: Could not write package_root config: {e}', file=sys.stderr)
 
-    skill_src = PACKAGE_ROOT / 'extras' / 'ralph-portable' / 'SKILL.md'
-    if skill_src.is_file():
+    skill_src = package_root / 'extras' / 'ralph-portable' / 'SKILL.md'
+    if os.path.isfile(skill_src):
         skill_dest_dir = home / '.cursor' / 'skills-cursor' / 'ralph-portable'
         try:
             skill_dest_dir.mkdir(parents=True, exist_ok=True)
             skill_dest = skill_dest_dir / 'SKILL.md'
-            if not skill_dest.exists() or force:
+            if not os.path.exists(skill_dest) or force:
                 shutil.copy2(skill_src, skill_dest)
                 print(f'Installed skill: {skill_dest}')
         except (OSError, PermissionError) as e:
             print(f'Warning: Could not install skill: {e}', file=sys.stderr)
 
-    print('Ralph Cursor commands installed to:', dest)
+    lines = [f'Ralph Cursor commands installed to: {dest}']
     if copied:
-        print('  Copied:', ', '.join(copied))
+        lines.append(f'  Copied: {", ".join(copied)}')
     if skipped:
-        print('  Skipped (exists, use --force):', ', '.join(skipped))
-    print('Package root recorded at:', config_dir / 'package_root')
-    print('Restart Cursor or reload window if commands do not appear yet.')
+        lines.append(f'  Skipped (exists, use --force): {", ".join(skipped)}')
+    lines.append(f'Package root recorded at: {config_dir / "package_root"}')
+    lines.append('Restart Cursor or reload window if commands do not appear yet.')
+    sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def handle_setup(args):
     """Merge Ralph .gitignore block into a project (--project, default cwd)."""
-    flags = parse_flags(args)
+    flags = parse_flags(args, value_flags=('--project',))
     if flags.get('--skip-gitignore'):
         print('Skipped .gitignore update (--skip-gitignore).')
         return
 
     project = flags.get('--project')
+    if project is True:
+        print('Error: --project requires a directory', file=sys.stderr)
+        sys.exit(1)
     if project:
         repo = Path(project).expanduser().resolve()
     else:
@@ -535,7 +814,7 @@ def handle_uninstall(args):
     Finds Ralph installation in PATH and removes it.
     """
     # Find ralph in PATH
-    ralph_path_str = shutil.which('ralph')
+    ralph_path_str = _which('ralph')
     
     if not ralph_path_str:
         print('Ralph is not installed in your PATH.', file=sys.stdout)
@@ -546,7 +825,7 @@ def handle_uninstall(args):
     ralph_path = Path(ralph_path_str).resolve()
     
     # Check if it exists
-    if not ralph_path.exists():
+    if not os.path.exists(ralph_path):
         print('Ralph installation found but file does not exist:', file=sys.stdout)
         print(f'  {ralph_path_str}', file=sys.stdout)
         print('', file=sys.stdout)
@@ -554,28 +833,22 @@ def handle_uninstall(args):
         sys.exit(0)
     
     # Check if it's a directory (shouldn't happen, but handle gracefully)
-    if ralph_path.is_dir():
+    if os.path.isdir(ralph_path):
         print('Error: Ralph installation path is a directory, not a file:', file=sys.stderr)
         print(f'  {ralph_path_str}', file=sys.stderr)
         print('', file=sys.stderr)
         print('This is unexpected. Please manually remove the directory if needed.', file=sys.stderr)
         sys.exit(1)
     
-    # Security: Verify this is actually a Python script (basic validation)
     # Security: Verify the file is a Python script to prevent removing wrong files
     # This is a basic check - if PATH is compromised, this provides some protection
     try:
-        if ralph_path.is_file():
+        if os.path.isfile(ralph_path):
             # Check if it starts with Python shebang (basic verification)
             with open(ralph_path, 'rb') as f:
-                first_line = f.read(100)  # Read first 100 bytes
-                if not first_line.startswith(b'#!/usr/bin/env python3') and not first_line.startswith(b'#!/usr/bin/python3'):
-                    print('Warning: The file found in PATH does not appear to be a Python script.', file=sys.stderr)
-                    print(f'  Found: {ralph_path_str}', file=sys.stderr)
-                    print('', file=sys.stderr)
-                    print('This may not be the Ralph CLI. For safety, uninstall was aborted.', file=sys.stderr)
-                    print('', file=sys.stderr)
-                    print('If you are sure this is the correct file, remove it manually.', file=sys.stderr)
+                first_line = f.read(_PYTHON_SHEBANG_LEN)
+                if not first_line.startswith(_PYTHON_SHEBANGS):
+                    sys.stderr.write(_UNINSTALL_NOT_PYTHON_MSG.format(path=ralph_path_str))
                     sys.exit(1)
     except (PermissionError, OSError) as e:
         print('Warning: Could not verify file contents:', file=sys.stderr)
@@ -590,12 +863,7 @@ def handle_uninstall(args):
         print('✓ Removed Ralph installation:', file=sys.stdout)
         print(f'  {ralph_path_str}', file=sys.stdout)
     except PermissionError:
-        print('Error: Permission denied when trying to remove:', file=sys.stderr)
-        print(f'  {ralph_path_str}', file=sys.stderr)
-        print('', file=sys.stderr)
-        print('Next steps:', file=sys.stderr)
-        print('  1. Try running with sudo: sudo ralph uninstall', file=sys.stderr)
-        print('  2. Or manually remove: rm', ralph_path_str, file=sys.stderr)
+        sys.stderr.write(_UNINSTALL_PERMISSION_DENIED_MSG.format(path=ralph_path_str))
         sys.exit(1)
     except Exception as e:
         print(f'Error: Failed to remove installation: {e}', file=sys.stderr)
@@ -608,70 +876,104 @@ def handle_version(args):
     Handle the 'version' command.
     
     Displays version information from VERSION file or git tag.
+    RALPH_VERSION_FILE, if set, is read instead of the package's VERSION file.
     """
     version = None
-    version_file = PACKAGE_ROOT / 'VERSION'
-    if version_file.exists():
+    package_root = _package_root()
+    version_file = Path(os.environ.get('RALPH_VERSION_FILE') or package_root / 'VERSION')
+    if os.path.isfile(version_file):
         try:
-            version = version_file.read_text(encoding='utf-8').strip()
-            # If file is empty or whitespace-only, treat as missing
-            if not version:
-                version = None
+            # Empty or whitespace-only reads as b'' and is treated as missing
+            version = version_file.read_bytes().strip()
         except Exception:
             pass
-    if not version:
+    # Only a checkout can answer `git describe`; installed copies skip the fork
+    if not version and os.path.exists(package_root / '.git'):
+        import subprocess
+
         try:
-            result = subprocess.run(['git', 'describe', '--tags', '--always'], cwd=str(PACKAGE_ROOT), capture_output=True, text=True, timeout=2)
+            result = subprocess.run(['git', 'describe', '--tags', '--always'], cwd=str(package_root), capture_output=True, timeout=2)
             if result.returncode == 0:
                 version = result.stdout.strip()
         except Exception:
             pass
     if not version:
-        version = '1.0.0'
+        version = b'1.0.0'
     
     # Security: Sanitize version string to prevent terminal escape sequence injection
-    # Remove control characters and limit length
-    import re
-    version_clean = version.lstrip('v')
-    # Remove control characters (0x00-0x1F, 0x7F) except newline/tab
-    version_clean = re.sub(r'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F]', '', version_clean)
-    # Limit length to prevent extremely long strings
-    if len(version_clean) > 50:
-        version_clean = version_clean[:50]
+    # Remove control characters on the raw bytes, then limit length
+    version_clean = version.lstrip(b'v').translate(None, _VERSION_CTRL_BYTES).decode('utf-8', 'replace')[:50]
     
     print(f'Ralph CLI v{version_clean}')
 
-def _print_available_commands():
-    """Print available commands list."""
-    print('Available commands:', file=sys.stderr)
-    print('  install-cursor  Install global Cursor slash commands (~/.cursor/commands/)', file=sys.stderr)
-    print('  init            Initialize Ralph in the current repository', file=sys.stderr)
-    print('  setup           Merge Ralph .gitignore block into a project', file=sys.stderr)
-    print('  run             Run Ralph agent loop', file=sys.stderr)
-    print('  uninstall       Uninstall Ralph symlink from your PATH', file=sys.stderr)
-    print('  version         Display version information', file=sys.stderr)
+
+_AVAILABLE_COMMANDS = (
+    'Available commands:\n'
+    '  install-cursor  Install global Cursor slash commands (~/.cursor/commands/)\n'
+    '  init            Initialize Ralph in the current repository\n'
+    '  setup           Merge Ralph .gitignore block into a project\n'
+    '  run             Run Ralph agent loop\n'
+    '  uninstall       Uninstall Ralph symlink from your PATH\n'
+    '  version         Display version information\n'
+)
+
+_ERR_NO_COMMAND = (
+    'Error: No command provided.\n'
+    '\n'
+    'Usage: ralph <command> [options]\n'
+    '\n'
+    + _AVAILABLE_COMMANDS +
+    '\n'
+    'Run "ralph --help" for more information.\n'
+)
+
+# Formatted with command and suggestion (from _suggest_command)
+_ERR_UNKNOWN_COMMAND = (
+    'Error: Unknown command "{command}".\n'
+    '\n'
+    + _AVAILABLE_COMMANDS +
+    '\n'
+    'Did you mean one of these?\n'
+    '{suggestion}'
+    '\n'
+    'Run "ralph --help" for detailed usage information.\n'
+)
+
+# Known command -> hint line, for _suggest_command's fuzzy match
+_COMMAND_SUGGESTIONS = {
+    'install-cursor': '  Try: ralph install-cursor\n',
+    'init': '  Try: ralph init\n',
+    'setup': '  Try: ralph setup --project .\n',
+    'run': '  Try: ralph run\n',
+    'uninstall': '  Try: ralph uninstall\n',
+    'version': '  Try: ralph version\n',
+}
+# Single-letter shorthands too short to fuzzy-match
+_COMMAND_ALIASES = {'i': 'init', 'r': 'run', 'u': 'uninstall', 'v': 'version'}
+
+_SUGGEST_FALLBACK = (
+    '  Try: ralph install-cursor  (bootstrap Cursor commands)\n'
+    '  Try: ralph init  (legacy in-repo runner)\n'
+    '  Try: ralph run   (agent loop)\n'
+    '  Try: ralph uninstall  (remove PATH symlink)\n'
+    '  Try: ralph version  (check version)\n'
+)
 
 
 def _suggest_command(command):
-    """Suggest a command based on user input."""
-    if 'install' in command.lower() or 'cursor' in command.lower():
-        print('  Try: ralph install-cursor', file=sys.stderr)
-    elif 'init' in command.lower() or command.lower() == 'i':
-        print('  Try: ralph init', file=sys.stderr)
-    elif 'setup' in command.lower():
-        print('  Try: ralph setup --project .', file=sys.stderr)
-    elif 'run' in command.lower() or command.lower() == 'r':
-        print('  Try: ralph run', file=sys.stderr)
-    elif 'uninstall' in command.lower() or command.lower() == 'u':
-        print('  Try: ralph uninstall', file=sys.stderr)
-    elif 'version' in command.lower() or command.lower() == 'v':
-        print('  Try: ralph version', file=sys.stderr)
-    else:
-        print('  Try: ralph install-cursor  (bootstrap Cursor commands)', file=sys.stderr)
-        print('  Try: ralph init  (legacy in-repo runner)', file=sys.stderr)
-        print('  Try: ralph run   (agent loop)', file=sys.stderr)
-        print('  Try: ralph uninstall  (remove PATH symlink)', file=sys.stderr)
-        print('  Try: ralph version  (check version)', file=sys.stderr)
+    """Return hint line(s) suggesting the closest known command for a mistyped one."""
+    command = command.lower()
+    match = _COMMAND_ALIASES.get(command)
+    if match is None:
+        # An unambiguous prefix wins; otherwise fall back to fuzzy matching
+        prefixed = [name for name in _COMMAND_SUGGESTIONS if name.startswith(command)]
+        match = prefixed[0] if len(prefixed) == 1 else None
+    if match is None:
+        import difflib
+
+        close = difflib.get_close_matches(command, _COMMAND_SUGGESTIONS, n=1, cutoff=0.5)
+        match = close[0] if close else None
+    return _COMMAND_SUGGESTIONS[match] if match else _SUGGEST_FALLBACK
 
 
 def print_help():
@@ -721,20 +1023,16 @@ Examples:
     print(help_text)
 
 
-def main():
-    """Main entry point."""
-    if len(sys.argv) < 2:
-        print('Error: No command provided.', file=sys.stderr)
-        print('', file=sys.stderr)
-        print('Usage: ralph <command> [options]', file=sys.stderr)
-        print('', file=sys.stderr)
-        _print_available_commands()
-        print('', file=sys.stderr)
-        print('Run "ralph --help" for more information.', file=sys.stderr)
+def main(argv=None):
+    """Main entry point. argv defaults to sys.argv[1:]."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        sys.stderr.write(_ERR_NO_COMMAND)
         sys.exit(1)
 
-    command = sys.argv[1]
-    args = sys.argv[2:]
+    command = argv[0]
+    args = argv[1:]
 
     # Handle help and version flags
     if command in ('-h', '--help'):
@@ -758,14 +1056,7 @@ def main():
     elif command == 'version':
         handle_version(args)
     else:
-        print(f'Error: Unknown command "{command}".', file=sys.stderr)
-        print('', file=sys.stderr)
-        _print_available_commands()
-        print('', file=sys.stderr)
-        print('Did you mean one of these?', file=sys.stderr)
-        _suggest_command(command)
-        print('', file=sys.stderr)
-        print('Run "ralph --help" for detailed usage information.', file=sys.stderr)
+        sys.stderr.write(_ERR_UNKNOWN_COMMAND.format(command=command, suggestion=_suggest_command(command)))
         sys.exit(1)
 
 
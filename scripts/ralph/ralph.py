@@ -8,34 +8,117 @@ Uses Cursor CLI as the worker
 --debug enables real-time output streaming for debugging
 """
 
-import argparse
+import functools
 import os
+import re
+import select
+import selectors
+import shutil
 import signal
 import subprocess
 import sys
 import time
-from datetime import datetime
+from collections import deque
 from pathlib import Path
 
+COMPLETION_SIGNAL = "<promise>COMPLETE</promise>"
+_COMPLETION_SIGNAL_BYTES = COMPLETION_SIGNAL.encode()
+# Worker output is streamed, not buffered: read size and how many reads are kept in memory
+OUTPUT_CHUNK_SIZE = 64 * 1024
+OUTPUT_TAIL_CHUNKS = 16
+# stream-json fields that may carry the text of an event, in order of preference
+_STREAM_TEXT_KEYS = ("text", "content", "delta")
+# "branch: <name>" metadata line in `bd show` output
+_BRANCH_RE = re.compile(r'^[ \t]*branch:[ \t]*(\S*)', re.M)
+# Model names may only contain alphanumerics, dash, underscore, and dot
+_MODEL_RE = re.compile(r'[A-Za-z0-9._-]+')
+# Characters not allowed in archive folder names
+_UNSAFE_FOLDER_CHARS_RE = re.compile(r'[^a-zA-Z0-9\-_]')
+
+
+def _extract_stream_text(data):
+    """Return the text carried by a parsed stream-json event, or "" if there is none"""
+    if isinstance(data, str):
+        return data
+    if not isinstance(data, dict):
+        return ""
+    for key in _STREAM_TEXT_KEYS:
+        text = data.get(key)
+        if text:
+            return text if isinstance(text, str) else ""
+    # Handle OpenAI-style format
+    for choice in data.get("choices") or ():
+        text = choice.get("delta", {}).get("content")
+        if text:
+            return text if isinstance(text, str) else ""
+    return ""
+
 
 class RalphAgent:
+    # Fixed attribute set; no per-instance __dict__
+    __slots__ = (
+        "max_iterations", "cursor_timeout", "model", "debug",
+        "_cursor_args", "running_processes", "interrupted",
+        "_command_cache", "_cursor_binary", "_ensured_dirs",
+        "_branch_name", "_branch_name_loaded", "_run_date",
+        "_wakeup_r", "_wakeup_w",
+        "script_dir", "archive_dir", "last_branch_file", "log_dir",
+        "repo_root", "_repo_root_str",
+    )
+
     def __init__(self, max_iterations=10, cursor_timeout=1800, model="auto", debug=False):
         self.max_iterations = max_iterations
         self.cursor_timeout = cursor_timeout
         self.model = model
         self.debug = debug
-        self.running_processes = []
+        
+        # Security: Validate model parameter to prevent command injection
+        # (once here; the model does not change during the run)
+        if not _MODEL_RE.fullmatch(model):
+            raise ValueError(f"Invalid model name: {model}")
+        # Cursor arguments shared by every iteration (binary and prompt are added per call)
+        self._cursor_args = ["--model", model, "--print", "--force", "--approve-mcps"]
+        if debug:
+            # Add streaming options for debug mode
+            self._cursor_args += ["--output-format", "stream-json", "--stream-partial-output"]
+        
+        # Live worker processes by pid; entries are dropped as soon as they are reaped
+        self.running_processes = {}
         self.interrupted = False
+        # PATH lookups memoized for the life of the run (command -> full path or None)
+        self._command_cache = {}
+        self._cursor_binary = None
+        # Directories already created this run (mkdir walks every ancestor)
+        self._ensured_dirs = set()
+        # Project epic branch, looked up from Beads at most once per run
+        self._branch_name = None
+        self._branch_name_loaded = False
+        # Date the run started, used for archive folder names
+        self._run_date = time.strftime("%Y-%m-%d")
         
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
+        # Self-pipe the interpreter writes to on each signal, so a select() waiting
+        # on the worker wakes up immediately
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        try:
+            signal.set_wakeup_fd(self._wakeup_w)
+        except ValueError:
+            # Not the main thread; waits still end once the handler kills the worker
+            pass
         
         # Get script directory
         self.script_dir = Path(__file__).parent.resolve()
         self.archive_dir = self.script_dir / "archive"
         self.last_branch_file = self.script_dir / ".last-branch"
         self.log_dir = self.script_dir / "logs"
+        # Repository root (the working directory) is fixed for the run; the string
+        # form is what the bd subprocess calls take as cwd
+        self.repo_root = Path.cwd()
+        self._repo_root_str = str(self.repo_root)
         
         # Check for Beads CLI availability
         if not self._command_exists("bd"):
@@ -45,8 +128,7 @@ class RalphAgent:
             )
         
         # Check if Beads is initialized in the repository
-        repo_root = Path.cwd()
-        beads_dir = repo_root / ".beads"
+        beads_dir = self.repo_root / ".beads"
         if not beads_dir.exists():
             raise FileNotFoundError(
                 "Beads not initialized in repository. "
@@ -56,6 +138,8 @@ class RalphAgent:
     def _signal_handler(self, signum, frame):
         """Handle Ctrl+C and other termination signals"""
         print("\n\nReceived interrupt signal. Cleaning up...", file=sys.stderr)
+        # Only a flag: the handler must not take locks the interrupted code may hold.
+        # The wakeup pipe already ends any select() waiting in the main loop.
         self.interrupted = True
         # Only kill processes if the list exists (defensive check)
         if hasattr(self, 'running_processes'):
@@ -64,7 +148,7 @@ class RalphAgent:
     
     def _kill_all_processes(self):
         """Kill all running subprocesses"""
-        for proc in self.running_processes:
+        for proc in list(self.running_processes.values()):
             if proc.poll() is None:  # Process is still running
                 try:
                     print(f"Killing process {proc.pid}...", file=sys.stderr)
@@ -85,9 +169,16 @@ class RalphAgent:
         
         Note: This returns the feature-level branchName, not phase-specific branches.
         Phase-specific branches are handled by the Cursor prompt.
+        The lookup costs a bd call per open epic, so it is done once and reused
+        for the rest of the run.
         """
-        repo_root = Path.cwd()
-        
+        if not self._branch_name_loaded:
+            self._branch_name = self._query_branch_name()
+            self._branch_name_loaded = True
+        return self._branch_name
+    
+    def _query_branch_name(self):
+        """Ask Beads for the project epic's branch (bd list, then bd show per open epic)"""
         # Find the project epic (top-level epic without a parent)
         try:
             result = subprocess.run(
@@ -95,7 +186,7 @@ class RalphAgent:
                 capture_output=True,
                 text=True,
                 timeout=5,
-                cwd=str(repo_root)
+                cwd=self._repo_root_str
             )
             if result.returncode != 0:
                 return None
@@ -104,15 +195,16 @@ class RalphAgent:
             # bd list outputs issue IDs, we need to check each one
             epic_ids = [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
             
-            # First pass: find the project epic (epic without a parent)
-            project_epic_id = None
+            # Find the project epic (epic without a parent); its `bd show` output
+            # already carries the branch metadata, so it is not fetched twice
+            project_epic_output = None
             for epic_id in epic_ids:
                 show_result = subprocess.run(
                     ['bd', 'show', epic_id],
                     capture_output=True,
                     text=True,
                     timeout=5,
-                    cwd=str(repo_root)
+                    cwd=self._repo_root_str
                 )
                 if show_result.returncode == 0:
                     output = show_result.stdout
@@ -120,29 +212,16 @@ class RalphAgent:
                     has_parent = any(line.strip().lower().startswith('parent:') for line in output.split('\n'))
                     if not has_parent:
                         # This is a top-level epic (project epic)
-                        project_epic_id = epic_id
+                        project_epic_output = output
                         break
             
             # If no project epic found, return None
-            if not project_epic_id:
+            if project_epic_output is None:
                 return None
             
-            # Second pass: get branch metadata from project epic
-            show_result = subprocess.run(
-                ['bd', 'show', project_epic_id],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                cwd=str(repo_root)
-            )
-            if show_result.returncode == 0:
-                output = show_result.stdout
-                for line in output.split('\n'):
-                    if line.strip().startswith('branch:'):
-                        branch = line.split(':', 1)[1].strip()
-                        return branch if branch else None
-            
-            return None
+            # Get branch metadata from project epic
+            match = _BRANCH_RE.search(project_epic_output)
+            return match.group(1) if match and match.group(1) else None
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return None
         except Exception:
@@ -172,14 +251,13 @@ class RalphAgent:
         
         if current_branch and last_branch and current_branch != last_branch:
             # Archive the previous run's branch tracking
-            date = datetime.now().strftime("%Y-%m-%d")
+            date = self._run_date
             # Strip "ralph/" prefix from branch name for folder
             folder_name = last_branch.replace("ralph/", "")
             
             # Security: Sanitize folder_name to prevent path traversal attacks
             # Only allow alphanumeric, dash, and underscore characters (no dots to prevent ..)
-            import re
-            folder_name = re.sub(r'[^a-zA-Z0-9\-_]', '_', folder_name)
+            folder_name = _UNSAFE_FOLDER_CHARS_RE.sub('_', folder_name)
             
             archive_folder = self.archive_dir / f"{date}-{folder_name}"
             
@@ -201,256 +279,173 @@ class RalphAgent:
     
     
     def _find_cursor_binary(self):
-        """Find the cursor binary, checking cursor-agent, then agent"""
+        """Find the cursor binary, checking cursor-agent, then agent (cached once found)"""
+        if self._cursor_binary is not None:
+            return self._cursor_binary
         for binary in ["cursor-agent", "agent"]:
-            if self._command_exists(binary):
-                return binary
+            binary_path = self._command_path(binary)
+            if binary_path is not None:
+                self._cursor_binary = binary_path
+                return binary_path
         # Raise error if neither binary is found
         raise FileNotFoundError("Neither 'cursor-agent' nor 'agent' binary found in PATH")
     
-    def _run_cursor_iteration(self, prompt_file, iteration=None):
+    def _load_prompt(self, prompt_file):
+        """Validate and read the prompt file (done once per run; it does not change)"""
+        # Security: Validate prompt_file path to prevent path traversal
+        prompt_file_path = Path(prompt_file)
+        if not prompt_file_path.is_absolute():
+            prompt_file_path = self.script_dir / prompt_file_path
+        prompt_file_path = prompt_file_path.resolve()
+        
+        # Ensure the prompt file is within the script directory to prevent path traversal
+        try:
+            prompt_file_path.relative_to(self.script_dir)
+        except ValueError:
+            raise ValueError(f"Prompt file path outside script directory: {prompt_file_path}")
+        
+        # A missing file surfaces as FileNotFoundError from open(); no separate stat
+        with open(prompt_file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def _run_cursor_iteration(self, prompt_text, iteration=None):
         """Run a single Cursor iteration"""
         proc = None
         log_file = None
         try:
-            # Security: Validate prompt_file path to prevent path traversal
-            prompt_file_path = Path(prompt_file)
-            if not prompt_file_path.is_absolute():
-                prompt_file_path = self.script_dir / prompt_file_path
-            prompt_file_path = prompt_file_path.resolve()
-            
-            # Ensure the prompt file is within the script directory to prevent path traversal
-            try:
-                prompt_file_path.relative_to(self.script_dir.resolve())
-            except ValueError:
-                raise ValueError(f"Prompt file path outside script directory: {prompt_file_path}")
-            
-            if not prompt_file_path.exists():
-                raise FileNotFoundError(f"Prompt file not found: {prompt_file_path}")
-            
-            with open(prompt_file_path, 'r', encoding='utf-8') as f:
-                prompt_text = f.read()
-            
-            # Security: Validate model parameter to prevent command injection
-            # Model should only contain alphanumeric, dash, underscore, and dot
-            if not all(c.isalnum() or c in ['-', '_', '.'] for c in self.model):
-                raise ValueError(f"Invalid model name: {self.model}")
-            
             # Build cursor command (prompt text will be passed as argument, matching bash behavior)
             # Security: Using list form of subprocess.Popen (not shell=True) prevents command injection
-            cursor_binary = self._find_cursor_binary()
-            cmd = [
-                cursor_binary,
-                "--model", self.model,
-                "--print",
-                "--force",
-                "--approve-mcps",
-            ]
-            
-            # Add streaming options for debug mode
-            if self.debug:
-                cmd.extend([
-                    "--output-format", "stream-json",
-                    "--stream-partial-output"
-                ])
-            
-            cmd.append(prompt_text)
-            
-            # Check if timeout command is available
-            use_timeout_cmd = self._command_exists("timeout")
+            cmd = [self._find_cursor_binary(), *self._cursor_args, prompt_text]
             
             # Set up environment for unbuffered output in debug mode
             env = os.environ.copy()
             if self.debug:
                 env['PYTHONUNBUFFERED'] = '1'
             
-            if use_timeout_cmd:
-                # Use timeout command (matches bash script behavior)
-                cmd = ["timeout", str(self.cursor_timeout)] + cmd
-                proc = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.DEVNULL,  # Close stdin (non-interactive)
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1 if self.debug else -1,  # Line buffered in debug, default otherwise
-                    env=env
-                )
-            else:
-                # Fallback: use Python timeout
-                proc = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.DEVNULL,  # Close stdin (non-interactive)
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1 if self.debug else -1,  # Line buffered in debug, default otherwise
-                    env=env
-                )
+            # close_fds stays at its default (True): fds inherited by ralph itself
+            # are not necessarily close-on-exec and must not leak into cursor
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,  # Close stdin (non-interactive)
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                # Output stays raw bytes in both modes; nothing is decoded in the hot path
+                env=env
+            )
             
-            self.running_processes.append(proc)
+            self.running_processes[proc.pid] = proc
             
             # Set up log file for debug mode
             if self.debug and iteration is not None:
                 # Create logs directory if it doesn't exist
-                self.log_dir.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(self.log_dir)
                 # Create log file with timestamp and iteration number
-                timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+                timestamp = time.strftime("%Y%m%d-%H%M%S")
                 log_file_path = self.log_dir / f"iteration-{iteration:03d}-{timestamp}.log"
-                log_file = open(log_file_path, 'w', encoding='utf-8')
+                log_file = open(log_file_path, 'wb')
                 print(f"Debug: Logging output to {log_file_path}", file=sys.stderr)
             
-            # Get output with timeout handling
-            stdout = ""
-            try:
-                if self.debug:
-                    # Real-time streaming mode for debugging using cursor-agent's stream-json
-                    import threading
-                    import json
-                    output_lines = []
+            if self.debug:
+                # Real-time streaming mode for debugging using cursor-agent's stream-json
+                import json
+                output_lines = []
+                
+                pending = b""
+                
+                def log_line(line):
+                    """Parse a stream-json line and write its text (or the raw line) to the log
                     
-                    def read_output():
-                        """Read and parse stream-json output and write to log file"""
+                    Lines are handled as bytes: json.loads parses them directly and
+                    lines without extractable text go to the log without a decode and
+                    re-encode round trip.
+                    """
+                    if not line.strip():
+                        return
+                    output_lines.append(line)
+                    text = ""
+                    # Only lines that can be a JSON object or string are parsed
+                    if line.lstrip()[:1] in (b'{', b'"'):
                         try:
-                            for line in proc.stdout:
-                                # Check for interrupt flag
-                                if self.interrupted:
-                                    break
-                                if not line.strip():
-                                    continue
-                                output_lines.append(line)
-                                try:
-                                    # Parse JSON line and extract text content
-                                    data = json.loads(line)
-                                    # Extract text from various possible fields
-                                    text = ""
-                                    if isinstance(data, dict):
-                                        # Look for common text fields in stream-json format
-                                        text = data.get("text", "") or data.get("content", "") or data.get("delta", "")
-                                        if not text and "choices" in data:
-                                            # Handle OpenAI-style format
-                                            for choice in data.get("choices", []):
-                                                delta = choice.get("delta", {})
-                                                text = delta.get("content", "")
-                                                if text:
-                                                    break
-                                    elif isinstance(data, str):
-                                        text = data
-                                    
-                                    if text:
-                                        # Write text to log file
-                                        if log_file:
-                                            log_file.write(text)
-                                            log_file.flush()
-                                    else:
-                                        # If no text found, write the raw line
-                                        if log_file:
-                                            log_file.write(line)
-                                            log_file.flush()
-                                except json.JSONDecodeError:
-                                    # If not JSON, write as-is
-                                    output_lines.append(line)
-                                    if log_file:
-                                        log_file.write(line)
-                                        log_file.flush()
-                        except Exception:
+                            # Parse JSON line and extract text content
+                            text = _extract_stream_text(json.loads(line))
+                        except ValueError:
+                            # Not JSON (or not UTF-8): written as-is below
                             pass
                     
-                    # Start reading thread
-                    reader_thread = threading.Thread(target=read_output, daemon=True)
-                    reader_thread.start()
-                    
-                    # Wait for process with timeout, checking for interrupts
-                    if use_timeout_cmd:
-                        # timeout command handles timeout, but we need to poll to check for interrupts
-                        while proc.poll() is None and not self.interrupted:
-                            time.sleep(0.1)  # Small sleep to avoid busy-waiting
-                        # If interrupted, kill the process (signal handler may have already done this)
-                        if self.interrupted and proc.poll() is None:
-                            proc.kill()
-                            proc.wait()
-                        exit_code = proc.returncode if proc.returncode is not None else 130
-                        # Check for timeout exit code (124 is timeout command's exit code)
-                        if exit_code == 124:
-                            print(f"Warning: Cursor iteration timed out after {self.cursor_timeout} seconds", file=sys.stderr)
-                        elif self.interrupted:
-                            exit_code = 130
-                    else:
-                        # Use Python timeout with interrupt checking
-                        try:
-                            # Poll with small intervals to check for interrupts
-                            start_time = time.time()
-                            while proc.poll() is None and not self.interrupted:
-                                elapsed = time.time() - start_time
-                                if elapsed >= self.cursor_timeout:
-                                    raise subprocess.TimeoutExpired(cmd, self.cursor_timeout)
-                                time.sleep(0.1)  # Small sleep to avoid busy-waiting
-                            # If interrupted, kill the process (signal handler may have already done this)
-                            if self.interrupted and proc.poll() is None:
-                                proc.kill()
-                                proc.wait()
-                            exit_code = proc.returncode if proc.returncode is not None else 130
-                        except subprocess.TimeoutExpired:
-                            print(f"Warning: Cursor iteration timed out after {self.cursor_timeout} seconds", file=sys.stderr)
-                            proc.kill()
-                            proc.wait()
-                            exit_code = 124
-                    
-                    # Wait for reader thread to finish (with interrupt check)
-                    if not self.interrupted:
-                        reader_thread.join(timeout=1)
-                    else:
-                        # If interrupted, don't wait long for thread
-                        reader_thread.join(timeout=0.1)
-                    stdout = ''.join(output_lines)
-                    
-                    # Close log file (always close, even on interrupt)
                     if log_file:
-                        log_file.close()
-                        log_file = None
-                else:
-                    # Buffered mode (default) - collect all output after completion
-                    # Note: communicate() blocks, but signal handler will kill the process
-                    # which will cause communicate() to return
-                    if use_timeout_cmd:
-                        stdout, _ = proc.communicate()
-                        exit_code = proc.returncode
-                        # Check for timeout exit code (124 is timeout command's exit code)
-                        if exit_code == 124:
-                            print(f"Warning: Cursor iteration timed out after {self.cursor_timeout} seconds", file=sys.stderr)
-                    else:
                         try:
-                            stdout, _ = proc.communicate(timeout=self.cursor_timeout)
-                            exit_code = proc.returncode
-                        except subprocess.TimeoutExpired:
-                            print(f"Warning: Cursor iteration timed out after {self.cursor_timeout} seconds", file=sys.stderr)
-                            proc.kill()
-                            stdout, _ = proc.communicate()
-                            exit_code = 124
-                    
-                    # Check if we were interrupted
+                            # Write extracted text, or the raw line if no text was found
+                            log_file.write(text.encode('utf-8') if text else line)
+                            log_file.flush()
+                        except OSError:
+                            # The log is best-effort; it must not end the iteration
+                            pass
+                
+                def on_output(chunk):
+                    """Split worker output into lines (read in the wait loop, no reader thread)"""
+                    nonlocal pending
+                    # Check for interrupt flag
                     if self.interrupted:
-                        # Process was killed by signal handler, exit_code may not be accurate
-                        exit_code = 130
-                    
-                    # Print to stderr for viewing
-                    print(stdout, file=sys.stderr, end='', flush=True)
-            except subprocess.TimeoutExpired:
-                print(f"Warning: Cursor iteration timed out after {self.cursor_timeout} seconds", file=sys.stderr)
-                if proc is not None:
+                        return
+                    lines = (pending + chunk).split(b'\n')
+                    pending = lines.pop()
+                    for line in lines:
+                        log_line(line + b'\n')
+            else:
+                # Streaming mode (default): echo output to stderr as it arrives, keeping
+                # only a bounded tail in memory and scanning the raw bytes for the
+                # completion signal (carrying its length over read boundaries)
+                err = sys.stderr.buffer
+                tail = deque(maxlen=OUTPUT_TAIL_CHUNKS)
+                completed = False
+                carry = b""
+                keep = len(_COMPLETION_SIGNAL_BYTES) - 1
+                
+                def on_output(chunk):
+                    """Echo a chunk of worker output and watch for the completion signal"""
+                    nonlocal carry, completed
+                    err.write(chunk)
+                    err.flush()
+                    tail.append(chunk)
+                    if not completed:
+                        window = carry + chunk
+                        completed = _COMPLETION_SIGNAL_BYTES in window
+                        carry = window[-keep:]
+            
+            # Wait for process with timeout, checking for interrupts (same loop for
+            # both modes; the signal handler kills the process, which ends it early)
+            exited = self._wait_for_worker(proc, self.cursor_timeout, on_output)
+            if self.interrupted:
+                # If interrupted, kill the process (signal handler may have already done this)
+                if proc.poll() is None:
                     proc.kill()
-                    if not self.debug:
-                        stdout, _ = proc.communicate()
-                    else:
-                        stdout = ''.join(output_lines) if 'output_lines' in locals() else ""
-                else:
-                    stdout = ""
+                    proc.wait()
+                exit_code = 130
+            elif exited:
+                exit_code = proc.returncode
+            else:
+                print(f"Warning: Cursor iteration timed out after {self.cursor_timeout} seconds", file=sys.stderr)
+                proc.kill()
+                proc.wait()
                 exit_code = 124
+            
+            if self.debug:
+                # Last line may lack a trailing newline
+                if pending and not self.interrupted:
+                    log_line(pending)
+                stdout = b''.join(output_lines).decode('utf-8', 'replace')
+                completed = self._check_completion(stdout)
+                
+                # Close log file (always close, even on interrupt)
                 if log_file:
                     log_file.close()
                     log_file = None
+            else:
+                stdout = b''.join(tail).decode('utf-8', 'replace')
             
-            return stdout
+            # Iterations run one at a time, so the finished process is simply dropped
+            self.running_processes.pop(proc.pid, None)
+            return stdout, completed
         except Exception as e:
             print(f"Error running cursor: {e}", file=sys.stderr)
             if proc is not None and proc.poll() is None:
@@ -464,24 +459,119 @@ class RalphAgent:
                         pass
             if log_file:
                 log_file.close()
-            return ""
+            if proc is not None:
+                self.running_processes.pop(proc.pid, None)
+            return "", False
+    
+    def _ensure_dir(self, path):
+        """Create a directory (and parents) once per run"""
+        if path in self._ensured_dirs:
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        self._ensured_dirs.add(path)
+    
+    def _command_path(self, command):
+        """Resolve a command to its full path in PATH, or None (memoized; no `which` subprocess)"""
+        try:
+            return self._command_cache[command]
+        except KeyError:
+            path = self._command_cache[command] = shutil.which(command)
+            return path
     
     def _command_exists(self, command):
         """Check if a command exists in PATH"""
+        return self._command_path(command) is not None
+    
+    def _wait_for_worker(self, proc, timeout, on_output=None):
+        """Wait until proc exits, timeout seconds pass, or a signal interrupts the run.
+        
+        A single select() covers a pidfd for the process (Linux 5.3+), the signal
+        wakeup pipe and, when on_output is given, the process's stdout pipe, whose
+        available output is read without blocking and passed to on_output as raw
+        bytes. Where pidfd_open is unavailable the loop wakes every 100 ms to poll
+        the process. Output still buffered at exit is drained without waiting for
+        EOF, so a stray holder of the pipe (e.g. a background grandchild) cannot
+        keep the iteration open.
+        
+        Returns True if the process exited.
+        """
+        out_fd = None
+        if on_output is not None:
+            out_fd = proc.stdout.fileno()
+            os.set_blocking(out_fd, False)
+        
+        def drain():
+            """Pass along whatever output is available; return False at EOF"""
+            while True:
+                try:
+                    chunk = os.read(out_fd, OUTPUT_CHUNK_SIZE)
+                except BlockingIOError:
+                    return True
+                if not chunk:
+                    return False
+                on_output(chunk)
+        
         try:
-            subprocess.run(
-                ["which", command],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True
-            )
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+            pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            pidfd = None
+        sel = selectors.DefaultSelector()
+        try:
+            sel.register(self._wakeup_r, selectors.EVENT_READ)
+            if pidfd is not None:
+                sel.register(pidfd, selectors.EVENT_READ)
+            if out_fd is not None:
+                sel.register(out_fd, selectors.EVENT_READ)
+            deadline = time.monotonic() + timeout
+            while not self.interrupted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = sel.select(remaining if pidfd is not None else min(remaining, 0.1))
+                pidfd_ready = pidfd is None
+                for key, _ in events:
+                    if key.fd == pidfd:
+                        pidfd_ready = True
+                    elif key.fd == self._wakeup_r:
+                        self._drain_wakeup_fd()
+                    elif not drain():
+                        sel.unregister(out_fd)
+                        out_fd = None
+                if pidfd_ready and proc.poll() is not None:
+                    self.running_processes.pop(proc.pid, None)
+                    # Pick up output written just before exit
+                    if out_fd is not None:
+                        drain()
+                    return True
+        finally:
+            sel.close()
+            if pidfd is not None:
+                os.close(pidfd)
+        return proc.poll() is not None
+    
+    def _drain_wakeup_fd(self):
+        """Discard the signal numbers queued on the wakeup pipe"""
+        try:
+            while os.read(self._wakeup_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+    
+    def _pause(self, seconds):
+        """Sleep up to seconds, returning early (True) once a signal has set interrupted"""
+        deadline = time.monotonic() + seconds
+        while not self.interrupted:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # The signal's byte on the wakeup pipe ends the select immediately
+            select.select([self._wakeup_r], [], [], remaining)
+            self._drain_wakeup_fd()
+        return self.interrupted
     
     def _check_completion(self, output):
         """Check if output contains completion signal"""
-        return "<promise>COMPLETE</promise>" in output
+        return COMPLETION_SIGNAL in output
     
     def run(self):
         """Main run loop"""
@@ -489,12 +579,18 @@ class RalphAgent:
         self._archive_previous_run()
         self._track_current_branch()
         
-        print(f"Starting Ralph - Max iterations: {self.max_iterations}")
-        print(f"Worker: Cursor")
-        print(f"Model: {self.model}")
-        print(f"Task tracker: Beads")
+        # Banners are rendered up front and written with one call each
+        startup = (
+            f"Starting Ralph - Max iterations: {self.max_iterations}\n"
+            f"Worker: Cursor\n"
+            f"Model: {self.model}\n"
+            f"Task tracker: Beads"
+        )
         if self.debug:
-            print(f"Debug mode: Output will be logged to {self.log_dir}/")
+            startup += f"\nDebug mode: Output will be logged to {self.log_dir}/"
+        print(startup)
+        rule = "═" * 55
+        iteration_banner = f"\n{rule}\n  Ralph Iteration {{}} of {self.max_iterations} (Worker: Cursor)\n{rule}"
         
         # Use Cursor prompt file (test mode if RALPH_TEST_MODE is set)
         if os.environ.get("RALPH_TEST_MODE") == "1":
@@ -502,52 +598,52 @@ class RalphAgent:
         else:
             prompt_file = self.script_dir / "cursor" / "prompt.cursor.md"
         
-        if not prompt_file.exists():
+        try:
+            prompt_text = self._load_prompt(prompt_file)
+        except FileNotFoundError:
             print(f"Error: Prompt file not found: {prompt_file}", file=sys.stderr)
             sys.exit(1)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
         
         # Main loop
         for i in range(1, self.max_iterations + 1):
             if self.interrupted:
                 break
             
-            print("")
-            print("═══════════════════════════════════════════════════════")
-            print(f"  Ralph Iteration {i} of {self.max_iterations} (Worker: Cursor)")
-            print("═══════════════════════════════════════════════════════")
+            print(iteration_banner.format(i))
             
             # Run iteration
-            output = self._run_cursor_iteration(prompt_file, iteration=i)
-            
-            # Remove completed process from tracking
-            self.running_processes = [p for p in self.running_processes if p.poll() is None]
+            _, completed = self._run_cursor_iteration(prompt_text, iteration=i)
             
             # Check for completion signal
-            if self._check_completion(output):
-                print("")
-                print("Ralph completed all tasks!")
-                print(f"Completed at iteration {i} of {self.max_iterations}")
+            if completed:
+                print(f"\nRalph completed all tasks!\nCompleted at iteration {i} of {self.max_iterations}")
                 return 0
             
             if self.interrupted:
                 break
             
             print(f"Iteration {i} complete. Continuing...")
-            time.sleep(2)
+            # Short pause between iterations that Ctrl+C cuts short
+            if self._pause(2):
+                break
         
         if self.interrupted:
             print("\nRalph interrupted by user.", file=sys.stderr)
             return 130
         else:
-            print("")
-            print(f"Ralph reached max iterations ({self.max_iterations}) without completing all tasks.")
-            print(f"Check Beads for task status: bd list --status open")
+            print(
+                f"\nRalph reached max iterations ({self.max_iterations}) without completing all tasks.\n"
+                f"Check Beads for task status: bd list --status open"
+            )
             return 1
 
 
-def main():
-    """Main entry point"""
-    # Parse environment variables
+@functools.lru_cache(maxsize=1)
+def _env_defaults():
+    """Return (cursor_timeout, model) defaults from the environment, parsed once per process"""
     # Parse cursor_timeout with error handling
     try:
         cursor_timeout = int(os.environ.get("RALPH_CURSOR_TIMEOUT", "1800"))
@@ -557,10 +653,20 @@ def main():
     except (ValueError, TypeError):
         print("Warning: Invalid RALPH_CURSOR_TIMEOUT value, using default 1800", file=sys.stderr)
         cursor_timeout = 1800
-    
-    model = os.environ.get("RALPH_MODEL", "auto")
-    
-    # Parse command line arguments
+
+    return cursor_timeout, os.environ.get("RALPH_MODEL", "auto")
+
+
+def _parse_args(argv, cursor_timeout, model):
+    """Return (max_iterations, cursor_timeout, model, debug) for the given command-line arguments"""
+    # Fast path for the common `ralph.py [N] [--debug]` forms: no argparse import or parser setup
+    positionals = [arg for arg in argv if arg != "--debug"]
+    if len(positionals) <= 1 and all(arg.isascii() and arg.isdigit() for arg in positionals):
+        max_iterations = int(positionals[0]) if positionals else 10
+        return max_iterations, cursor_timeout, model, "--debug" in argv
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Ralph Wiggum - Long-running AI agent loop (uses Cursor CLI)",
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -590,15 +696,27 @@ def main():
         help="Enable debug mode with real-time output streaming"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    return args.max_iterations, args.cursor_timeout, args.model, args.debug
+
+
+def main():
+    """Main entry point"""
+    cursor_timeout, model = _env_defaults()
+    max_iterations, cursor_timeout, model, debug = _parse_args(sys.argv[1:], cursor_timeout, model)
     
     # Create and run agent
-    agent = RalphAgent(
-        max_iterations=args.max_iterations,
-        cursor_timeout=args.cursor_timeout,
-        model=args.model,
-        debug=args.debug
-    )
+    try:
+        agent = RalphAgent(
+            max_iterations=max_iterations,
+            cursor_timeout=cursor_timeout,
+            model=model,
+            debug=debug
+        )
+    except ValueError as e:
+        # Bad RALPH_MODEL / --model: report it like a bad argument, not a traceback
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
     
     sys.exit(agent.run())
 
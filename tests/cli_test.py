@@ -3,26 +3,90 @@
 Tests for Ralph CLI - converted from tests/cli.test.js
 """
 
+import atexit
+import contextlib
+import errno
+import functools
+import importlib.util
+import io
 import os
 import re
 import subprocess
+import sys
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Get the CLI path relative to the project root
 PROJECT_ROOT = Path(__file__).parent.parent
 CLI_PATH = PROJECT_ROOT / 'bin' / 'ralph.py'
+# Interpreter for CLI subprocesses: this one, without a PATH lookup. The CLI and
+# the stub runners only use the standard library, so site initialization is skipped.
+PYTHON = [sys.executable, '-S']
+# Command prefix for running the CLI in a subprocess
+CLI_CMD = [*PYTHON, str(CLI_PATH)]
+# The runner ralph init installs, relative to the project directory
+RALPH_PY_REL = 'scripts/ralph/ralph.py'
+
+
+def _tmp_root():
+    """Where test directories go: RALPH_TEST_TMP, else /dev/shm when it is an exec-capable tmpfs."""
+    root = os.environ.get('RALPH_TEST_TMP')
+    if root:
+        return root
+    try:
+        if not os.statvfs('/dev/shm').f_flag & getattr(os, 'ST_NOEXEC', 0):
+            return '/dev/shm'
+    except OSError:
+        pass
+    return None
+
+
+# Test directories live in memory where possible; the tests create and delete many small trees
+TMP_ROOT = _tmp_root()
+
+# Test directories are deleted in the background while the next test runs
+_CLEANUP = ThreadPoolExecutor(max_workers=2, thread_name_prefix='rmtmp')
+atexit.register(_CLEANUP.shutdown, wait=True)
+
+
+@contextlib.contextmanager
+def scratch_dir(prefix):
+    """Yield a fresh directory under TMP_ROOT; it is removed by the cleanup pool afterwards."""
+    path = tempfile.mkdtemp(prefix=prefix, dir=TMP_ROOT)
+    try:
+        yield path
+    finally:
+        _CLEANUP.submit(shutil.rmtree, path, ignore_errors=True)
+
+
+# Files ralph init must create, relative to the project directory
+REQUIRED_FILES = (
+    RALPH_PY_REL,
+    'scripts/ralph/cursor/prompt.cursor.md',
+)
 
 
 def run_cli(args, cwd, env=None):
-    """Run the CLI command and return the result."""
+    """Run the CLI command and return the result.
+
+    Commands run in this interpreter to skip a cold Python start per call;
+    `run` can hand off to a runner script, so it still gets its own process.
+    """
+    if args[:1] == ['run']:
+        return run_cli_subprocess(args, cwd, env)
+    return run_cli_inproc(args, cwd, env)
+
+
+def run_cli_subprocess(args, cwd, env=None):
+    """Run the CLI in a fresh interpreter process and return the result."""
     run_env = os.environ.copy()
     if env:
         run_env.update(env)
     result = subprocess.run(
-        ['python3', str(CLI_PATH)] + args,
-        cwd=str(cwd),
+        [*CLI_CMD, *args],
+        cwd=cwd,
         env=run_env,
         capture_output=True,
         text=True
@@ -34,44 +98,126 @@ def run_cli(args, cwd, env=None):
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _cli_module():
+    """bin/ralph.py imported as a module, loaded once per test process."""
+    spec = importlib.util.spec_from_file_location('ralph_cli', CLI_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_cli_inproc(args, cwd, env=None):
+    """Call the CLI's main() in this interpreter and return the result."""
+    cli = _cli_module()
+    saved_cwd = os.getcwd()
+    saved_stdin = sys.stdin
+    saved_env = os.environ.copy()
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    try:
+        os.chdir(cwd)
+        sys.stdin = io.StringIO()
+        if env:
+            os.environ.update(env)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                cli.main(list(args))
+            except SystemExit as e:
+                if isinstance(e.code, int) or e.code is None:
+                    code = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+                    code = 1
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        sys.stdin = saved_stdin
+        os.chdir(saved_cwd)
+    return {
+        'code': code,
+        'stdout': out.getvalue(),
+        'stderr': err.getvalue()
+    }
+
+
+def write_executable(path, text):
+    """Write text to path and mark it executable, through a single descriptor."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        os.write(fd, text.encode())
+        os.fchmod(fd, 0o755)
+    finally:
+        os.close(fd)
+
+
+def snapshot_tree(root, *dirs):
+    """Map 'dir/name' to its stat result for every entry of the given directories under root."""
+    tree = {}
+    for rel in dirs:
+        with os.scandir(os.path.join(root, rel)) as entries:
+            for entry in entries:
+                tree[f'{rel}/{entry.name}'] = entry.stat()
+    return tree
+
+
+@functools.lru_cache(maxsize=1)
+def _seed_init():
+    """
+    Run `ralph init` once into a fresh directory and return (directory, run_cli result).
+    Tests only read from it; tests that modify the files work on a copy.
+    """
+    root = tempfile.mkdtemp(prefix='ralph-seed-', dir=TMP_ROOT)
+    atexit.register(shutil.rmtree, root, ignore_errors=True)
+    result = run_cli(['init'], root)
+    assert result['code'] == 0, f"Seed init failed: {result['stderr']}"
+    return root, result
+
+
+def copy_initialized_tree(test_dir):
+    """Give test_dir the files `ralph init` creates, without running init again."""
+    shutil.copytree(_seed_init()[0], test_dir, symlinks=True, dirs_exist_ok=True)
+
+
+@functools.lru_cache(maxsize=1)
+def stub_bin():
+    """Directory of stub binaries (`cursor`, `bd`), written once and shared by the tests that need them."""
+    bin_dir = tempfile.mkdtemp(prefix='ralph-stub-bin-', dir=TMP_ROOT)
+    atexit.register(shutil.rmtree, bin_dir, ignore_errors=True)
+    cursor_path = Path(bin_dir) / 'cursor'
+    write_executable(cursor_path, '#!/bin/bash\necho "stub cursor"\nexit 0\n')
+    write_executable(Path(bin_dir) / 'bd', '#!/bin/sh\nexit 0\n')
+    return bin_dir
+
+
 def test_ralph_init_creates_directory_and_files():
     """Test that ralph init creates scripts/ralph/ directory and files."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['init'], test_dir)
         assert result['code'] == 0, f"Expected exit code 0, got {result['code']}. stderr: {result['stderr']}"
 
         # Check that required files were created
-        required_files = [
-            'scripts/ralph/ralph.py',
-            'scripts/ralph/cursor/prompt.cursor.md',
-        ]
-
-        for file in required_files:
-            file_path = Path(test_dir) / file
-            assert file_path.exists(), f"File {file} was not created"
+        tree = snapshot_tree(test_dir, 'scripts/ralph', 'scripts/ralph/cursor')
+        missing = [file for file in REQUIRED_FILES if file not in tree]
+        assert not missing, f"Files were not created: {', '.join(missing)}"
 
         proj_cursor_cmds = Path(test_dir) / '.cursor' / 'commands'
         assert not proj_cursor_cmds.exists(), 'init should not copy project .cursor/commands by default'
 
         # Check that ralph.py is executable
-        ralph_py_path = Path(test_dir) / 'scripts/ralph/ralph.py'
-        assert os.access(ralph_py_path, os.X_OK), 'ralph.py is not executable'
+        assert tree[RALPH_PY_REL].st_mode & 0o111, 'ralph.py is not executable'
 
         assert 'Created' in result['stdout'] or 'file' in result['stdout'], 'Should show files were created'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_init_does_not_overwrite_existing_files():
     """Test that ralph init does not overwrite existing files by default."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         # First init
-        run_cli(['init'], test_dir)
+        copy_initialized_tree(test_dir)
 
         # Read original content
-        ralph_py_path = Path(test_dir) / 'scripts/ralph/ralph.py'
+        ralph_py_path = Path(test_dir) / RALPH_PY_REL
         original_content = ralph_py_path.read_text()
 
         # Modify the file
@@ -86,19 +232,16 @@ def test_ralph_init_does_not_overwrite_existing_files():
         current_content = ralph_py_path.read_text()
         assert current_content == modified_content, 'File should not be overwritten'
         assert 'Skipped' in result['stdout'], 'Should show files were skipped'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_init_force_overwrites_existing_files():
     """Test that ralph init --force overwrites existing files."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         # First init
-        run_cli(['init'], test_dir)
+        copy_initialized_tree(test_dir)
 
         # Modify the file
-        ralph_py_path = Path(test_dir) / 'scripts/ralph/ralph.py'
+        ralph_py_path = Path(test_dir) / RALPH_PY_REL
         modified_content = '# Modified'
         ralph_py_path.write_text(modified_content)
 
@@ -110,16 +253,13 @@ def test_ralph_init_force_overwrites_existing_files():
         current_content = ralph_py_path.read_text()
         assert current_content != modified_content, 'File should be overwritten'
         assert len(current_content) > len(modified_content), 'File should have original content'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_run_invokes_repo_local_runner():
     """Test that ralph run invokes repo-local runner."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         # Initialize
-        run_cli(['init'], test_dir)
+        copy_initialized_tree(test_dir)
 
         # Create stub runner that just prints a message
         stub_runner = """#!/usr/bin/env python3
@@ -128,37 +268,29 @@ print("STUB_RUNNER_CALLED")
 print(f"ITERATIONS: {sys.argv[1] if len(sys.argv) > 1 else '10'}")
 sys.exit(0)
 """
-        ralph_py_path = Path(test_dir) / 'scripts/ralph/ralph.py'
-        ralph_py_path.write_text(stub_runner)
-        ralph_py_path.chmod(0o755)
-
-        # Create stub binaries directory
-        bin_dir = Path(test_dir) / 'bin'
-        bin_dir.mkdir(parents=True, exist_ok=True)
+        ralph_py_path = Path(test_dir) / RALPH_PY_REL
+        write_executable(ralph_py_path, stub_runner)
 
-        # Run with modified PATH
+        # Run with the stub binaries first on PATH
         env = os.environ.copy()
-        env['PATH'] = f"{bin_dir}:{env.get('PATH', '')}"
+        env['PATH'] = f"{stub_bin()}:{env.get('PATH', '')}"
         result = subprocess.run(
-            ['python3', str(CLI_PATH), 'run', '5'],
-            cwd=str(test_dir),
+            [*CLI_CMD, 'run', '5'],
+            cwd=test_dir,
             env=env,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
         )
 
-        assert 'STUB_RUNNER_CALLED' in result.stdout, 'Runner should be invoked'
-        assert 'ITERATIONS: 5' in result.stdout, 'Iterations should be passed'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+        assert b'STUB_RUNNER_CALLED' in result.stdout, 'Runner should be invoked'
+        assert b'ITERATIONS: 5' in result.stdout, 'Iterations should be passed'
 
 
 def test_ralph_run_executes_ralph_py():
     """Test that ralph run executes ralph.py."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         # Initialize
-        run_cli(['init'], test_dir)
+        copy_initialized_tree(test_dir)
 
         # Create stub runner
         stub_runner = """#!/usr/bin/env python3
@@ -167,73 +299,41 @@ print("STUB_RUNNER_CALLED")
 print(f"ITERATIONS: {sys.argv[1] if len(sys.argv) > 1 else '10'}")
 sys.exit(0)
 """
-        ralph_py_path = Path(test_dir) / 'scripts/ralph/ralph.py'
-        ralph_py_path.write_text(stub_runner)
-        ralph_py_path.chmod(0o755)
-
-        # Create stub cursor binary
-        bin_dir = Path(test_dir) / 'bin'
-        bin_dir.mkdir(parents=True, exist_ok=True)
-
-        stub_cursor = """#!/bin/bash
-echo "stub cursor"
-exit 0
-"""
-        cursor_path = bin_dir / 'cursor'
-        cursor_path.write_text(stub_cursor)
-        cursor_path.chmod(0o755)
+        ralph_py_path = Path(test_dir) / RALPH_PY_REL
+        write_executable(ralph_py_path, stub_runner)
 
-        # Run with cursor worker
+        # Run with the stub cursor worker
         env = os.environ.copy()
-        env['PATH'] = f"{bin_dir}:{env.get('PATH', '')}"
+        env['PATH'] = f"{stub_bin()}:{env.get('PATH', '')}"
         result = subprocess.run(
-            ['python3', str(CLI_PATH), 'run'],
-            cwd=str(test_dir),
+            [*CLI_CMD, 'run'],
+            cwd=test_dir,
             env=env,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
         )
 
-        assert 'STUB_RUNNER_CALLED' in result.stdout, 'Runner should be invoked'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
-
-
-def test_ralph_run_fails_if_not_initialized():
-    """Test that ralph run fails if not initialized."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
-        result = run_cli(['run'], test_dir)
-        assert result['code'] != 0, 'Should exit with error code'
-        assert 'not initialized' in result['stderr'] or 'not initialized' in result['stdout'], \
-            'Should indicate Ralph is not initialized'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+        assert b'STUB_RUNNER_CALLED' in result.stdout, 'Runner should be invoked'
 
 
 def test_ralph_init_installs_cursor_files():
     """Test that ralph init installs cursor files."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
-        result = run_cli(['init'], test_dir)
-        assert result['code'] == 0
+    test_dir, result = _seed_init()
+    assert result['code'] == 0
 
-        # Check cursor files exist
-        cursor_prompt_path = Path(test_dir) / 'scripts/ralph/cursor/prompt.cursor.md'
-        assert cursor_prompt_path.exists()
+    # Check cursor files exist
+    cursor_prompt_path = Path(test_dir) / 'scripts/ralph/cursor/prompt.cursor.md'
+    assert cursor_prompt_path.exists()
 
-        # Check common files exist
-        ralph_py_path = Path(test_dir) / 'scripts/ralph/ralph.py'
-        assert ralph_py_path.exists()
+    # Check common files exist
+    ralph_py_path = Path(test_dir) / RALPH_PY_REL
+    assert ralph_py_path.exists()
 
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_invalid_command_shows_helpful_error():
     """Test that invalid commands show helpful usage hints."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['invalid-command'], test_dir)
         assert result['code'] != 0, 'Should exit with error code'
         # Should mention the invalid command
@@ -243,37 +343,39 @@ def test_ralph_invalid_command_shows_helpful_error():
         assert 'run' in result['stderr'] or 'run' in result['stdout']
         # Should suggest help
         assert '--help' in result['stderr'] or '--help' in result['stdout']
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_init_copy_project_commands_installs_cursor_files():
     """Optional --copy-project-commands copies .md commands into the repo."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['init', '--copy-project-commands'], test_dir)
         assert result['code'] == 0
         p = Path(test_dir) / '.cursor' / 'commands' / 'prd-to-beads.md'
         assert p.exists(), 'prd-to-beads.md should exist when --copy-project-commands'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_init_no_cursorignore_skips_file():
     """--no-cursorignore should not create .cursorignore."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['init', '--no-cursorignore'], test_dir)
         assert result['code'] == 0
         assert not (Path(test_dir) / '.cursorignore').exists()
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_ralph_init_cursor_cli_writes_config_when_cursor_dir_exists():
+    """--cursor-cli should write .cursor/cli.json even if .cursor/ already exists."""
+    with scratch_dir('ralph-test-') as test_dir:
+        (Path(test_dir) / '.cursor').mkdir()
+        result = run_cli(['init', '--cursor-cli'], test_dir)
+        assert result['code'] == 0
+        cli_json = Path(test_dir) / '.cursor' / 'cli.json'
+        assert cli_json.exists(), '.cursor/cli.json should be created'
+        assert '"mcpServers"' in cli_json.read_text()
 
 
 def test_ralph_install_cursor_writes_commands_and_config():
     """install-cursor copies to ~/.cursor/commands under a fake HOME."""
-    fake_home = tempfile.mkdtemp(prefix='ralph-fakehome-')
-    try:
+    with scratch_dir('ralph-fakehome-') as fake_home:
         result = run_cli(['install-cursor'], PROJECT_ROOT, env={'HOME': fake_home})
         assert result['code'] == 0, result['stderr']
         dest = Path(fake_home) / '.cursor' / 'commands' / 'prd-to-beads.md'
@@ -281,27 +383,21 @@ def test_ralph_install_cursor_writes_commands_and_config():
         root_file = Path(fake_home) / '.config' / 'ralph-cursor' / 'package_root'
         assert root_file.exists()
         assert str(PROJECT_ROOT.resolve()) in root_file.read_text()
-    finally:
-        shutil.rmtree(fake_home, ignore_errors=True)
 
 
 def test_ralph_install_cursor_skips_existing_without_force():
     """Second install without --force skips existing command files."""
-    fake_home = tempfile.mkdtemp(prefix='ralph-fakehome-')
-    try:
+    with scratch_dir('ralph-fakehome-') as fake_home:
         r1 = run_cli(['install-cursor'], PROJECT_ROOT, env={'HOME': fake_home})
         assert r1['code'] == 0
         r2 = run_cli(['install-cursor'], PROJECT_ROOT, env={'HOME': fake_home})
         assert r2['code'] == 0
         assert 'Skipped' in r2['stdout'] or 'skipped' in r2['stdout'].lower()
-    finally:
-        shutil.rmtree(fake_home, ignore_errors=True)
 
 
 def test_ralph_setup_writes_gitignore_block():
     """setup merges Ralph gitignore markers."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['setup', '--project', test_dir], test_dir)
         assert result['code'] == 0, result['stderr']
         gi = Path(test_dir) / '.gitignore'
@@ -313,14 +409,11 @@ def test_ralph_setup_writes_gitignore_block():
         r2 = run_cli(['setup', '--project', test_dir], test_dir)
         assert r2['code'] == 0
         assert gi.read_text(encoding='utf-8').count('# >>> ralph-cursor') == 1
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_setup_adds_agents_claude_when_untracked():
     """Untracked AGENTS.md / CLAUDE.md (typical after bd init) get ignore lines."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         subprocess.run(['git', 'init', '-q'], cwd=test_dir, check=True)
         (Path(test_dir) / 'AGENTS.md').write_text('beads\n', encoding='utf-8')
         (Path(test_dir) / 'CLAUDE.md').write_text('beads\n', encoding='utf-8')
@@ -336,14 +429,11 @@ def test_ralph_setup_adds_agents_claude_when_untracked():
         assert 'AGENTS.md' in block
         assert 'CLAUDE.md' in block
         assert '.claude/' in block
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_setup_omits_agents_when_tracked():
     """Tracked AGENTS.md is not added to the Ralph ignore block."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         subprocess.run(['git', 'init', '-q'], cwd=test_dir, check=True)
         subprocess.run(
             ['git', 'config', 'user.email', 'test@test.local'],
@@ -366,14 +456,11 @@ def test_ralph_setup_omits_agents_when_tracked():
         block = m.group(1)
         assert 'AGENTS.md' not in block
         assert 'CLAUDE.md' in block
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_setup_omits_dot_claude_when_tracked():
     """Do not add .claude/ to ignore block when something under .claude is tracked."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         subprocess.run(['git', 'init', '-q'], cwd=test_dir, check=True)
         subprocess.run(
             ['git', 'config', 'user.email', 'test@test.local'],
@@ -396,54 +483,128 @@ def test_ralph_setup_omits_dot_claude_when_tracked():
         m = re.search(r'# >>> ralph-cursor\n(.*?)# <<< ralph-cursor', text, re.DOTALL)
         block = m.group(1)
         assert '.claude/' not in block
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_setup_skip_gitignore_noop():
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['setup', '--project', test_dir, '--skip-gitignore'], test_dir)
         assert result['code'] == 0
         assert not (Path(test_dir) / '.gitignore').exists()
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_ralph_setup_project_equals_form():
+    """setup accepts --project=DIR; switches never swallow the next argument."""
+    with scratch_dir('ralph-test-') as test_dir:
+        result = run_cli(['setup', f'--project={test_dir}'], test_dir)
+        assert result['code'] == 0, result['stderr']
+        assert '# >>> ralph-cursor' in (Path(test_dir) / '.gitignore').read_text(encoding='utf-8')
+
+        result = run_cli(['setup', '--project'], test_dir)
+        assert result['code'] != 0
+        assert '--project requires a directory' in result['stderr']
 
 
 def test_ralph_run_project_requires_beads():
     """run --project fails when .beads is missing."""
-    empty = tempfile.mkdtemp(prefix='ralph-nobeads-')
-    try:
+    with scratch_dir('ralph-nobeads-') as empty:
         result = run_cli(['run', '--project', empty], PROJECT_ROOT)
         assert result['code'] != 0
         combined = (result['stderr'] + result['stdout']).lower()
         assert 'beads' in combined
-    finally:
-        shutil.rmtree(empty, ignore_errors=True)
 
 
 def test_ralph_run_missing_ralph_py_shows_clear_guidance():
-    """Test that ralph run provides clear guidance when ralph.py is missing."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    """Test that ralph run fails if not initialized, with clear guidance about the missing ralph.py."""
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['run'], test_dir)
         assert result['code'] != 0, 'Should exit with error code'
         # Should clearly indicate the problem
-        assert 'not initialized' in result['stderr'].lower() or 'not initialized' in result['stdout'].lower()
+        assert 'not initialized' in result['stderr'] or 'not initialized' in result['stdout'], \
+            'Should indicate Ralph is not initialized'
         # Should provide actionable next step
         assert 'init' in result['stderr'].lower() or 'init' in result['stdout'].lower()
         # Should mention the missing file
         assert 'ralph.py' in result['stderr'] or 'ralph.py' in result['stdout']
+
+
+def test_ralph_init_force_in_package_checkout_keeps_templates():
+    """Test that init --force in the package's own checkout does not truncate its templates (edge case)."""
+    with scratch_dir('ralph-test-checkout-') as checkout:
+        # A checkout without templates/: init's sources are the destination files themselves
+        for rel in ('bin/ralph.py', RALPH_PY_REL, 'scripts/ralph/cursor/prompt.cursor.md', '.cursorignore'):
+            dest = Path(checkout) / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(PROJECT_ROOT / rel, dest)
+        os.mkdir(Path(checkout) / '.beads')
+        originals = {rel: (Path(checkout) / rel).read_bytes() for rel in REQUIRED_FILES}
+
+        env = os.environ.copy()
+        env['PATH'] = f"{stub_bin()}:{env.get('PATH', '')}"
+        result = subprocess.run(
+            [*PYTHON, str(Path(checkout) / 'bin' / 'ralph.py'), 'init', '--force'],
+            cwd=checkout,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True
+        )
+
+        for rel, content in originals.items():
+            assert (Path(checkout) / rel).read_bytes() == content, f'{rel} should be left untouched'
+        assert 'same file' in result.stderr, 'Should report that source and destination are the same file'
+
+
+@contextlib.contextmanager
+def patched_os(**replacements):
+    """Temporarily replace os functions (e.g. copy_file_range) seen by the CLI's copy helpers."""
+    missing = object()
+    saved = {name: getattr(os, name, missing) for name in replacements}
+    for name, value in replacements.items():
+        setattr(os, name, value)
+    try:
+        yield
     finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+        for name, value in saved.items():
+            if value is missing:
+                delattr(os, name)
+            else:
+                setattr(os, name, value)
+
+
+def test_ralph_init_copy_falls_back_when_kernel_copy_fails():
+    """Test that template copies still deliver every byte when kernel copies move nothing, fail, or stop part way."""
+    cli = _cli_module()
+    expected = CLI_PATH.read_bytes()
+    real_copy_file_range = getattr(os, 'copy_file_range', None)
+
+    def copy_once_then_zero(infd, outfd, count, offset_src, offset_dst):
+        # Copies a short first piece, then reports 0 like some filesystems do
+        if offset_src == 0 and real_copy_file_range is not None:
+            return real_copy_file_range(infd, outfd, min(count, 1000), offset_src, offset_dst)
+        return 0
+
+    def exdev(*args):
+        raise OSError(errno.EXDEV, 'Invalid cross-device link')
+
+    cases = {
+        'copy_file_range returns 0': dict(copy_file_range=lambda *args: 0),
+        'copy_file_range raises EXDEV': dict(copy_file_range=exdev),
+        'both kernel copies return 0': dict(copy_file_range=lambda *args: 0, sendfile=lambda *args: 0),
+        'short copy then 0': dict(copy_file_range=copy_once_then_zero, sendfile=exdev),
+    }
+    with scratch_dir('ralph-test-') as test_dir:
+        for name, replacements in cases.items():
+            dst = Path(test_dir) / 'copy'
+            with patched_os(**replacements):
+                cli._fast_copy(str(CLI_PATH), str(dst))
+            assert dst.read_bytes() == expected, f'Copy should be complete when {name}'
 
 
 def test_ralph_init_missing_source_file_shows_clear_error():
     """Test that ralph init shows clear error when source files are missing."""
     # This test simulates a corrupted installation where templates are missing
     # We'll test by checking the error message format
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         # The init should still work normally, but we're testing the error message format
         # for when source files are missing (which shouldn't happen in normal usage)
         # We'll verify that warnings include helpful context
@@ -451,28 +612,21 @@ def test_ralph_init_missing_source_file_shows_clear_error():
         # If there are warnings, they should include helpful context
         if 'Warning' in result['stderr'] or 'Warning' in result['stdout']:
             assert 'not found' in result['stderr'] or 'not found' in result['stdout']
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_init_success_message_is_clear():
     """Test that ralph init success message is clear and informative."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
-        result = run_cli(['init'], test_dir)
-        assert result['code'] == 0
-        # Should show summary
-        assert 'Summary' in result['stdout'] or 'Created' in result['stdout']
-        # Should indicate next step
-        assert 'run' in result['stdout'].lower() or 'initialized' in result['stdout'].lower()
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+    _, result = _seed_init()
+    assert result['code'] == 0
+    # Should show summary
+    assert 'Summary' in result['stdout'] or 'Created' in result['stdout']
+    # Should indicate next step
+    assert 'run' in result['stdout'].lower() or 'initialized' in result['stdout'].lower()
 
 
 def test_ralph_no_command_shows_usage():
     """Test that running ralph with no command shows usage information."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli([], test_dir)
         assert result['code'] != 0, 'Should exit with error code'
         # Should show usage
@@ -482,14 +636,11 @@ def test_ralph_no_command_shows_usage():
         assert 'run' in result['stderr'] or 'run' in result['stdout']
         # Should suggest help
         assert '--help' in result['stderr'] or '--help' in result['stdout']
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
-def test_ralph_uninstall_finds_and_removes_symlink():
-    """Test that ralph uninstall finds and removes symlink installation."""
-    test_project_dir = tempfile.mkdtemp(prefix='ralph-test-project-')
-    try:
+def _check_uninstall_removes(install_kind):
+    """Install a fake `ralph` of install_kind ('symlink' or 'file'), run uninstall, and check it is removed."""
+    with scratch_dir('ralph-test-project-') as test_project_dir:
         # Create test project structure with bin/ralph.py
         test_project_bin = Path(test_project_dir) / 'bin'
         test_project_bin.mkdir(parents=True, exist_ok=True)
@@ -497,84 +648,52 @@ def test_ralph_uninstall_finds_and_removes_symlink():
         
         # Copy the actual CLI to the test project
         shutil.copy2(CLI_PATH, test_cli_path)
-        test_cli_path.chmod(0o755)
+        os.chmod(test_cli_path, 0o755)
         
         # Create install directory (simulating ~/.local/bin or similar)
         install_dir = Path(test_project_dir) / 'install' / 'bin'
         install_dir.mkdir(parents=True, exist_ok=True)
         install_path = install_dir / 'ralph'
         
-        # Create symlink from install directory to test project's CLI
-        install_path.symlink_to(test_cli_path)
+        if install_kind == 'symlink':
+            # Create symlink from install directory to test project's CLI
+            os.symlink(test_cli_path, install_path)
+        else:
+            # Create a file (not symlink) to simulate installation
+            write_executable(install_path, '#!/usr/bin/env python3\nprint("ralph")\n')
         
         # Run uninstall with PATH including install directory first, then python3 location
         env = os.environ.copy()
         # Find python3 location to keep it in PATH
-        python3_dir = Path(shutil.which('python3')).parent
+        python3_dir = Path(sys.executable).parent
         env['PATH'] = f"{install_dir}:{python3_dir}"
         result = subprocess.run(
-            ['python3', str(test_cli_path), 'uninstall'],
-            cwd=str(test_project_dir),
+            [*PYTHON, str(test_cli_path), 'uninstall'],
+            cwd=test_project_dir,
             env=env,
             capture_output=True,
             text=True
         )
         
         assert result.returncode == 0, f"Expected exit code 0, got {result.returncode}. stderr: {result.stderr}"
-        assert not install_path.exists(), 'Symlink should be removed'
+        assert not install_path.exists(), f'{install_kind.capitalize()} should be removed'
         assert 'removed' in result.stdout.lower() or 'uninstalled' in result.stdout.lower(), \
             'Should indicate removal'
-    finally:
-        shutil.rmtree(test_project_dir, ignore_errors=True)
+
+
+def test_ralph_uninstall_finds_and_removes_symlink():
+    """Test that ralph uninstall finds and removes symlink installation."""
+    _check_uninstall_removes('symlink')
 
 
 def test_ralph_uninstall_finds_and_removes_file():
     """Test that ralph uninstall finds and removes file installation."""
-    test_project_dir = tempfile.mkdtemp(prefix='ralph-test-project-')
-    try:
-        # Create test project structure with bin/ralph.py
-        test_project_bin = Path(test_project_dir) / 'bin'
-        test_project_bin.mkdir(parents=True, exist_ok=True)
-        test_cli_path = test_project_bin / 'ralph.py'
-        
-        # Copy the actual CLI to the test project
-        shutil.copy2(CLI_PATH, test_cli_path)
-        test_cli_path.chmod(0o755)
-        
-        # Create install directory (simulating ~/.local/bin or similar)
-        install_dir = Path(test_project_dir) / 'install' / 'bin'
-        install_dir.mkdir(parents=True, exist_ok=True)
-        install_path = install_dir / 'ralph'
-        
-        # Create a file (not symlink) to simulate installation
-        install_path.write_text('#!/usr/bin/env python3\nprint("ralph")\n')
-        install_path.chmod(0o755)
-        
-        # Run uninstall with PATH including install directory first, then python3 location
-        env = os.environ.copy()
-        # Find python3 location to keep it in PATH
-        python3_dir = Path(shutil.which('python3')).parent
-        env['PATH'] = f"{install_dir}:{python3_dir}"
-        result = subprocess.run(
-            ['python3', str(test_cli_path), 'uninstall'],
-            cwd=str(test_project_dir),
-            env=env,
-            capture_output=True,
-            text=True
-        )
-        
-        assert result.returncode == 0, f"Expected exit code 0, got {result.returncode}. stderr: {result.stderr}"
-        assert not install_path.exists(), 'File should be removed'
-        assert 'removed' in result.stdout.lower() or 'uninstalled' in result.stdout.lower(), \
-            'Should indicate removal'
-    finally:
-        shutil.rmtree(test_project_dir, ignore_errors=True)
+    _check_uninstall_removes('file')
 
 
 def test_ralph_uninstall_provides_clear_feedback():
     """Test that ralph uninstall provides clear feedback about what was removed."""
-    test_project_dir = tempfile.mkdtemp(prefix='ralph-test-project-')
-    try:
+    with scratch_dir('ralph-test-project-') as test_project_dir:
         # Create test project structure with bin/ralph.py
         test_project_bin = Path(test_project_dir) / 'bin'
         test_project_bin.mkdir(parents=True, exist_ok=True)
@@ -582,7 +701,7 @@ def test_ralph_uninstall_provides_clear_feedback():
         
         # Copy the actual CLI to the test project
         shutil.copy2(CLI_PATH, test_cli_path)
-        test_cli_path.chmod(0o755)
+        os.chmod(test_cli_path, 0o755)
         
         # Create install directory (simulating ~/.local/bin or similar)
         install_dir = Path(test_project_dir) / 'install' / 'bin'
@@ -590,18 +709,19 @@ def test_ralph_uninstall_provides_clear_feedback():
         install_path = install_dir / 'ralph'
         
         # Create symlink from install directory to test project's CLI
-        install_path.symlink_to(test_cli_path)
+        os.symlink(test_cli_path, install_path)
         
         # Run uninstall with PATH including install directory first, then python3 location
         env = os.environ.copy()
         # Find python3 location to keep it in PATH
-        python3_dir = Path(shutil.which('python3')).parent
+        python3_dir = Path(sys.executable).parent
         env['PATH'] = f"{install_dir}:{python3_dir}"
         result = subprocess.run(
-            ['python3', str(test_cli_path), 'uninstall'],
-            cwd=str(test_project_dir),
+            [*PYTHON, str(test_cli_path), 'uninstall'],
+            cwd=test_project_dir,
             env=env,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True
         )
         
@@ -609,14 +729,11 @@ def test_ralph_uninstall_provides_clear_feedback():
         # Should mention what was removed
         assert str(install_path) in result.stdout or 'ralph' in result.stdout.lower(), \
             'Should mention what was removed'
-    finally:
-        shutil.rmtree(test_project_dir, ignore_errors=True)
 
 
 def test_ralph_uninstall_handles_not_installed_gracefully():
     """Test that ralph uninstall handles case where Ralph is not installed gracefully."""
-    test_project_dir = tempfile.mkdtemp(prefix='ralph-test-project-')
-    try:
+    with scratch_dir('ralph-test-project-') as test_project_dir:
         # Create test project structure with bin/ralph.py
         test_project_bin = Path(test_project_dir) / 'bin'
         test_project_bin.mkdir(parents=True, exist_ok=True)
@@ -624,7 +741,7 @@ def test_ralph_uninstall_handles_not_installed_gracefully():
         
         # Copy the actual CLI to the test project
         shutil.copy2(CLI_PATH, test_cli_path)
-        test_cli_path.chmod(0o755)
+        os.chmod(test_cli_path, 0o755)
         
         # Create install directory (but no ralph binary)
         install_dir = Path(test_project_dir) / 'install' / 'bin'
@@ -633,74 +750,60 @@ def test_ralph_uninstall_handles_not_installed_gracefully():
         # Run uninstall with PATH including install directory first, then python3 location
         env = os.environ.copy()
         # Find python3 location to keep it in PATH
-        python3_dir = Path(shutil.which('python3')).parent
+        python3_dir = Path(sys.executable).parent
         env['PATH'] = f"{install_dir}:{python3_dir}"
         result = subprocess.run(
-            ['python3', str(test_cli_path), 'uninstall'],
-            cwd=str(test_project_dir),
+            [*PYTHON, str(test_cli_path), 'uninstall'],
+            cwd=test_project_dir,
             env=env,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True
         )
         
         # Should exit with 0 (graceful) or non-zero but with helpful message
         assert result.returncode == 0 or 'not installed' in result.stdout.lower() or 'not found' in result.stdout.lower(), \
             'Should handle not installed case gracefully'
-    finally:
-        shutil.rmtree(test_project_dir, ignore_errors=True)
 
 
 def test_ralph_help_includes_uninstall():
     """Test that help text includes uninstall command."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['--help'], test_dir)
         assert result['code'] == 0
         assert 'uninstall' in result['stdout'].lower(), 'Help should include uninstall command'
         assert 'install-cursor' in result['stdout'].lower(), 'Help should include install-cursor'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_version_displays_version_info():
     """Test that ralph version displays version information."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['version'], test_dir)
         assert result['code'] == 0, f"Expected exit code 0, got {result['code']}. stderr: {result['stderr']}"
         # Should show version in format "Ralph CLI vX.Y.Z"
         assert 'ralph cli v' in result['stdout'].lower(), 'Should display version in correct format'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_version_flag_displays_version_info():
     """Test that ralph --version displays version information."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['--version'], test_dir)
         assert result['code'] == 0, f"Expected exit code 0, got {result['code']}. stderr: {result['stderr']}"
         # Should show version in format "Ralph CLI vX.Y.Z"
         assert 'ralph cli v' in result['stdout'].lower(), 'Should display version in correct format'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_help_includes_version():
     """Test that help text includes version command."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         result = run_cli(['--help'], test_dir)
         assert result['code'] == 0
         assert 'version' in result['stdout'].lower(), 'Help should include version command'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_uninstall_rejects_directory():
     """Test that ralph uninstall rejects if PATH points to a directory (edge case)."""
-    test_project_dir = tempfile.mkdtemp(prefix='ralph-test-project-')
-    try:
+    with scratch_dir('ralph-test-project-') as test_project_dir:
         # Create test project structure with bin/ralph.py
         test_project_bin = Path(test_project_dir) / 'bin'
         test_project_bin.mkdir(parents=True, exist_ok=True)
@@ -708,7 +811,7 @@ def test_ralph_uninstall_rejects_directory():
         
         # Copy the actual CLI to the test project
         shutil.copy2(CLI_PATH, test_cli_path)
-        test_cli_path.chmod(0o755)
+        os.chmod(test_cli_path, 0o755)
         
         # Create install directory
         install_dir = Path(test_project_dir) / 'install' / 'bin'
@@ -726,18 +829,19 @@ def test_ralph_uninstall_rejects_directory():
         # For now, we'll create an executable symlink that points to a directory,
         # but shutil.which may not follow it. Let's test the actual behavior.
         install_path = install_dir / 'ralph'
-        install_path.symlink_to(target_dir)
+        os.symlink(target_dir, install_path)
         
         # Run uninstall with PATH including install directory first, then python3 location
         env = os.environ.copy()
         # Find python3 location to keep it in PATH
-        python3_dir = Path(shutil.which('python3')).parent
+        python3_dir = Path(sys.executable).parent
         env['PATH'] = f"{install_dir}:{python3_dir}"
         result = subprocess.run(
-            ['python3', str(test_cli_path), 'uninstall'],
-            cwd=str(test_project_dir),
+            [*PYTHON, str(test_cli_path), 'uninstall'],
+            cwd=test_project_dir,
             env=env,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True
         )
         
@@ -747,14 +851,11 @@ def test_ralph_uninstall_rejects_directory():
         # The actual directory check in the code is defensive but unlikely to trigger
         assert result.returncode == 0 or 'not installed' in result.stdout.lower(), \
             'Should handle directory case gracefully (shutil.which won\'t find directories)'
-    finally:
-        shutil.rmtree(test_project_dir, ignore_errors=True)
 
 
 def test_ralph_uninstall_rejects_non_python_binary():
     """Test that ralph uninstall rejects non-Python binaries (security fix)."""
-    test_project_dir = tempfile.mkdtemp(prefix='ralph-test-project-')
-    try:
+    with scratch_dir('ralph-test-project-') as test_project_dir:
         # Create test project structure with bin/ralph.py
         test_project_bin = Path(test_project_dir) / 'bin'
         test_project_bin.mkdir(parents=True, exist_ok=True)
@@ -762,7 +863,7 @@ def test_ralph_uninstall_rejects_non_python_binary():
         
         # Copy the actual CLI to the test project
         shutil.copy2(CLI_PATH, test_cli_path)
-        test_cli_path.chmod(0o755)
+        os.chmod(test_cli_path, 0o755)
         
         # Create install directory with a non-Python binary
         install_dir = Path(test_project_dir) / 'install' / 'bin'
@@ -770,17 +871,16 @@ def test_ralph_uninstall_rejects_non_python_binary():
         install_path = install_dir / 'ralph'
         
         # Create a non-Python file (bash script without Python shebang)
-        install_path.write_text('#!/bin/bash\necho "not ralph"\n')
-        install_path.chmod(0o755)
+        write_executable(install_path, '#!/bin/bash\necho "not ralph"\n')
         
         # Run uninstall with PATH including install directory first, then python3 location
         env = os.environ.copy()
         # Find python3 location to keep it in PATH
-        python3_dir = Path(shutil.which('python3')).parent
+        python3_dir = Path(sys.executable).parent
         env['PATH'] = f"{install_dir}:{python3_dir}"
         result = subprocess.run(
-            ['python3', str(test_cli_path), 'uninstall'],
-            cwd=str(test_project_dir),
+            [*PYTHON, str(test_cli_path), 'uninstall'],
+            cwd=test_project_dir,
             env=env,
             capture_output=True,
             text=True
@@ -790,124 +890,68 @@ def test_ralph_uninstall_rejects_non_python_binary():
         assert result.returncode != 0, 'Should exit with error when binary is not Python'
         assert 'python' in result.stderr.lower() or 'python' in result.stdout.lower(), \
             'Should indicate binary verification failed'
-    finally:
-        shutil.rmtree(test_project_dir, ignore_errors=True)
+
+
+def run_version_with_file(content):
+    """Run `ralph version` against a VERSION file holding content (via RALPH_VERSION_FILE)."""
+    with scratch_dir('ralph-test-') as test_dir:
+        version_file = Path(test_dir) / 'VERSION'
+        version_file.write_text(content)
+        return run_cli(['version'], test_dir, env={'RALPH_VERSION_FILE': str(version_file)})
 
 
 def test_ralph_version_handles_empty_file():
     """Test that ralph version handles empty VERSION file (edge case)."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
-        # Create empty VERSION file
-        version_file = PROJECT_ROOT / 'VERSION'
-        original_content = None
-        if version_file.exists():
-            original_content = version_file.read_text()
-        
-        try:
-            version_file.write_text('')
-            
-            result = run_cli(['version'], test_dir)
-            # Should still work (fallback to git or default)
-            assert result['code'] == 0, 'Should handle empty version file gracefully'
-            assert 'ralph cli v' in result['stdout'].lower(), 'Should display version'
-        finally:
-            # Restore original content
-            if original_content is not None:
-                version_file.write_text(original_content)
-            elif version_file.exists():
-                version_file.unlink()
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+    result = run_version_with_file('')
+    # Should still work (fallback to git or default)
+    assert result['code'] == 0, 'Should handle empty version file gracefully'
+    assert 'ralph cli v' in result['stdout'].lower(), 'Should display version'
 
 
 def test_ralph_version_handles_whitespace_only_file():
     """Test that ralph version handles whitespace-only VERSION file (edge case)."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
-        # Create whitespace-only VERSION file
-        version_file = PROJECT_ROOT / 'VERSION'
-        original_content = None
-        if version_file.exists():
-            original_content = version_file.read_text()
-        
-        try:
-            version_file.write_text('   \n\t  \n')
-            
-            result = run_cli(['version'], test_dir)
-            # Should still work (fallback to git or default)
-            assert result['code'] == 0, 'Should handle whitespace-only file'
-            assert 'ralph cli v' in result['stdout'].lower(), 'Should display version'
-        finally:
-            # Restore original content
-            if original_content is not None:
-                version_file.write_text(original_content)
-            elif version_file.exists():
-                version_file.unlink()
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+    result = run_version_with_file('   \n\t  \n')
+    # Should still work (fallback to git or default)
+    assert result['code'] == 0, 'Should handle whitespace-only file'
+    assert 'ralph cli v' in result['stdout'].lower(), 'Should display version'
 
 
 def test_ralph_version_sanitizes_control_characters():
     """Test that ralph version sanitizes control characters in version string (security fix)."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
-        # Create VERSION file with control characters
-        version_file = PROJECT_ROOT / 'VERSION'
-        original_content = None
-        if version_file.exists():
-            original_content = version_file.read_text()
-        
-        try:
-            # Version with control characters (ANSI escape sequence)
-            version_file.write_text('1.0.0\x1b[31mRED\x1b[0m')
-            
-            result = run_cli(['version'], test_dir)
-            # Should sanitize and display version
-            assert result['code'] == 0, 'Should handle control characters'
-            assert 'ralph cli v' in result['stdout'].lower(), 'Should display version'
-            # Should not contain the escape sequence
-            assert '\x1b[31m' not in result['stdout'], 'Should sanitize control characters'
-        finally:
-            # Restore original content
-            if original_content is not None:
-                version_file.write_text(original_content)
-            elif version_file.exists():
-                version_file.unlink()
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+    # Version with control characters (ANSI escape sequence)
+    result = run_version_with_file('1.0.0\x1b[31mRED\x1b[0m')
+    # Should sanitize and display version
+    assert result['code'] == 0, 'Should handle control characters'
+    assert 'ralph cli v' in result['stdout'].lower(), 'Should display version'
+    # Should not contain the escape sequence
+    assert '\x1b[31m' not in result['stdout'], 'Should sanitize control characters'
 
 
 def test_ralph_run_rejects_non_python_runner():
     """Test that ralph run rejects non-Python runner script (security fix)."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         # Initialize
-        run_cli(['init'], test_dir)
+        copy_initialized_tree(test_dir)
         
         # Create a non-Python file at scripts/ralph/ralph.py
-        ralph_py_path = Path(test_dir) / 'scripts/ralph/ralph.py'
-        ralph_py_path.write_text('#!/bin/bash\necho "not python"\n')
-        ralph_py_path.chmod(0o755)
+        ralph_py_path = Path(test_dir) / RALPH_PY_REL
+        write_executable(ralph_py_path, '#!/bin/bash\necho "not python"\n')
         
         result = run_cli(['run'], test_dir)
         # Should exit with error (validation should catch .py extension requirement)
         # Note: This test may pass if validation is lenient, but should at least not execute
         assert result['code'] != 0 or 'python' in result['stderr'].lower() or 'extension' in result['stderr'].lower(), \
             'Should reject or warn about non-Python runner script'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
 def test_ralph_run_rejects_directory_runner():
     """Test that ralph run rejects directory at runner script path (security fix)."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+    with scratch_dir('ralph-test-') as test_dir:
         # Initialize
-        run_cli(['init'], test_dir)
+        copy_initialized_tree(test_dir)
         
         # Remove the file and create a directory instead
-        ralph_py_path = Path(test_dir) / 'scripts/ralph/ralph.py'
+        ralph_py_path = Path(test_dir) / RALPH_PY_REL
         if ralph_py_path.exists():
             ralph_py_path.unlink()
         ralph_py_path.mkdir(parents=True, exist_ok=True)
@@ -917,40 +961,82 @@ def test_ralph_run_rejects_directory_runner():
         assert result['code'] != 0, 'Should exit with error when runner is a directory'
         assert 'file' in result['stderr'].lower() or 'directory' in result['stderr'].lower(), \
             'Should indicate path is not a file'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
 
 
-def test_ralph_run_handles_missing_python3():
-    """Test that ralph run handles missing python3 gracefully (edge case)."""
-    test_dir = tempfile.mkdtemp(prefix='ralph-test-')
-    try:
+def test_ralph_run_does_not_need_python3_in_path():
+    """Test that ralph run executes the runner in-process, without looking up python3 (edge case)."""
+    with scratch_dir('ralph-test-') as test_dir:
         # Initialize
-        run_cli(['init'], test_dir)
-        
-        # Run with PATH that doesn't include python3
-        # Use sys.executable to get the full path to python3, then test that ralph.py
-        # can't find python3 when running the runner script
-        import sys
-        python3_path = sys.executable
+        copy_initialized_tree(test_dir)
+
+        # Create stub runner
+        stub_runner = """#!/usr/bin/env python3
+import sys
+print("STUB_RUNNER_CALLED")
+print(f"ARGS: {sys.argv[1:]}")
+sys.exit(3)
+"""
+        ralph_py_path = Path(test_dir) / RALPH_PY_REL
+        ralph_py_path.write_text(stub_runner)
+
+        # Run with PATH that doesn't include python3; the runner must still
+        # run because it is executed by the same interpreter
         env = os.environ.copy()
         env['PATH'] = '/nonexistent'
         result = subprocess.run(
-            [python3_path, str(CLI_PATH), 'run'],
-            cwd=str(test_dir),
+            [*CLI_CMD, 'run', '2'],
+            cwd=test_dir,
             env=env,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
         )
         
-        # Should exit with error and provide helpful message
-        assert result.returncode != 0, 'Should exit with error when python3 is not available'
-        assert 'python' in result.stderr.lower() or 'python' in result.stdout.lower(), \
-            'Should mention python3 in error message'
-    finally:
-        shutil.rmtree(test_dir, ignore_errors=True)
+        assert b'STUB_RUNNER_CALLED' in result.stdout, 'Runner should be invoked without python3 in PATH'
+        assert b"ARGS: ['2']" in result.stdout, 'Arguments should be passed to the runner'
+        assert result.returncode == 3, "Runner's exit status should be passed through"
 
 
+
+def test_ralph_run_runner_errors_keep_traceback():
+    """Test that an exception raised by the runner is reported with its traceback."""
+    with scratch_dir('ralph-test-') as test_dir:
+        copy_initialized_tree(test_dir)
+        ralph_py_path = Path(test_dir) / RALPH_PY_REL
+        ralph_py_path.write_text('#!/usr/bin/env python3\nraise RuntimeError("boom")\n')
+
+        result = run_cli(['run'], test_dir)
+
+        assert result['code'] != 0, 'Should exit with error code'
+        assert 'Traceback' in result['stderr'], 'Runner errors should keep their traceback'
+        assert 'RuntimeError: boom' in result['stderr']
+        assert 'Failed to execute runner script' not in result['stderr']
+
+def test_ralph_run_restores_interpreter_state():
+    """Test that an in-process run restores argv, sys.path[0], cwd and __main__."""
+    with scratch_dir('ralph-test-') as test_dir:
+        os.makedirs(Path(test_dir) / '.beads')
+        saved = (sys.argv, sys.path[0], os.getcwd(), sys.modules.get('__main__'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                _cli_module().main(['run', '--project', test_dir, '--help'])
+            except SystemExit as e:
+                assert not e.code, 'Runner --help should exit 0'
+        restored = (sys.argv, sys.path[0], os.getcwd(), sys.modules.get('__main__'))
+        os.chdir(saved[2])
+
+        assert restored == saved, 'Caller state should be restored after the runner exits'
+
+def test_ralph_run_rejects_invalid_model():
+    """Test that an invalid RALPH_MODEL is reported as an error, not a traceback."""
+    with scratch_dir('ralph-test-') as test_dir:
+        copy_initialized_tree(test_dir)
+
+        result = run_cli(['run', '1'], test_dir, env={'RALPH_MODEL': 'gpt 4'})
+
+        assert result['code'] == 1, 'Should exit with error code 1'
+        assert 'Invalid model name: gpt 4' in result['stderr']
+        assert 'Traceback' not in result['stderr'], 'Bad models should not print a traceback'
+
 if __name__ == '__main__':
     import sys
     # Simple test runner